@@ -48,7 +48,9 @@ import psycopg2
 import psycopg2.extras
 from clickhouse_driver import Client as CHClient
 
-from validate_scoring import parse_template, compute_criterion_percentage, is_manually_scored
+from validate_scoring import (
+    DELTA, parse_template, compute_criterion_percentage, compute_scorecard_scores, is_manually_scored,
+)
 
 # ── Configuration ──────────────────────────────────────────────────────────────
 
@@ -244,6 +246,30 @@ def compute_scores_for_scorecard(sc, director_scores, criteria):
     return computed_scores
 
 
+def find_score_drift(scorecards, computed_scores):
+    """Recompute scorecard scores for the whole batch and compare against the PG value.
+
+    Returns list of (scorecard_id, pg_score, recomputed_score) for scorecards whose
+    PG score differs from the recomputed one by more than DELTA. Scorecards with no
+    computed rows are skipped (nothing to recompute from).
+    """
+    auto_failed_ids = [sc["resource_id"] for sc in scorecards if sc["auto_failed"]]
+    recomputed = compute_scorecard_scores(computed_scores, auto_failed_ids)
+
+    drift = []
+    for sc in scorecards:
+        sc_id = sc["resource_id"]
+        if sc_id not in recomputed:
+            continue
+        pg_score = sc["score"]
+        new_score = recomputed[sc_id]
+        if pg_score is None and new_score is None:
+            continue
+        if pg_score is None or new_score is None or abs(pg_score - new_score) >= DELTA:
+            drift.append((sc_id, pg_score, new_score))
+    return drift
+
+
 def fetch_dev_users(pg_cur, customer_id, agent_user_ids):
     if not agent_user_ids:
         return {}
@@ -417,6 +443,7 @@ def process_batch(pg_cur, customer, profile, scorecards):
 
     scorecard_rows = []
     score_rows = []
+    all_computed = []
     no_scores_count = 0
     for sc in scorecards:
         is_dev = dev_users.get(sc["agent_user_id"], False)
@@ -427,10 +454,13 @@ def process_batch(pg_cur, customer, profile, scorecards):
         computed = compute_scores_for_scorecard(sc, dir_scores, criteria)
         if not computed:
             no_scores_count += 1
+        all_computed.extend(computed)
         for css in computed:
             score_rows.append(build_ch_score_row(sc, css, is_dev))
 
-    return scorecard_rows, score_rows, no_scores_count
+    drift = find_score_drift(scorecards, all_computed)
+
+    return scorecard_rows, score_rows, no_scores_count, drift
 
 
 def run_dry_run(pg_conn, customer, profile, template_ids, start_date, end_date, sample_size=3):
@@ -451,7 +481,8 @@ def run_dry_run(pg_conn, customer, profile, template_ids, start_date, end_date,
     if not scorecards:
         return
 
-    scorecard_rows, score_rows, no_scores = process_batch(pg_cur, customer, profile, scorecards)
+    scorecard_rows, score_rows, no_scores, drift = process_batch(pg_cur, customer, profile, scorecards)
+    drift_by_id = {sc_id: new_score for sc_id, _, new_score in drift}
 
     for i, (sc, sc_row) in enumerate(zip(scorecards, scorecard_rows)):
         print(f"\n── Scorecard {i+1}: {sc['resource_id']} ──")
@@ -461,6 +492,8 @@ def run_dry_run(pg_conn, customer, profile, template_ids, start_date, end_date,
         print(f"    created_at:           {sc['created_at']}")
         print(f"    process_interaction_at:{sc['process_interaction_at']}")
         print(f"    score:                {sc['score']}")
+        if sc["resource_id"] in drift_by_id:
+            print(f"    recomputed score:     {drift_by_id[sc['resource_id']]}  (DRIFT)")
         print(f"\n  CH scorecard_d row:")
         print(json.dumps(format_row_as_dict(CH_SCORECARD_COLUMNS, sc_row), indent=4))
 
@@ -474,6 +507,8 @@ def run_dry_run(pg_conn, customer, profile, template_ids, start_date, end_date,
 
     if no_scores:
         print(f"\n  WARNING: {no_scores} sample scorecards have no computed score rows.")
+    if drift:
+        print(f"\n  WARNING: {len(drift)} sample scorecards have a PG score that differs from the recomputed score.")
 
 
 def run_backfill(pg_conn, ch_client, customer, profile, template_ids, start_date, end_date, limit=None):
@@ -492,6 +527,7 @@ def run_backfill(pg_conn, ch_client, customer, profile, template_ids, start_date
     total_sc_inserted = 0
     total_score_inserted = 0
     total_no_scores = 0
+    all_drift = []
     all_inserted_ids = []
 
     while offset < effective_total:
@@ -500,8 +536,9 @@ def run_backfill(pg_conn, ch_client, customer, profile, template_ids, start_date
         if not scorecards:
             break
 
-        scorecard_rows, score_rows, no_scores = process_batch(pg_cur, customer, profile, scorecards)
+        scorecard_rows, score_rows, no_scores, drift = process_batch(pg_cur, customer, profile, scorecards)
         total_no_scores += no_scores
+        all_drift.extend(drift)
         all_inserted_ids.extend(sc["resource_id"] for sc in scorecards)
 
         if scorecard_rows:
@@ -522,6 +559,13 @@ def run_backfill(pg_conn, ch_client, customer, profile, template_ids, start_date
     if total_no_scores:
         print(f"\n  Note: {total_no_scores} scorecards had no computed score rows (no director.scores or no template match).")
 
+    if all_drift:
+        print(f"\n  WARNING: {len(all_drift)} scorecards have a stale PG score (differs from recomputed by >= {DELTA}):")
+        for sc_id, pg_score, new_score in all_drift[:10]:
+            print(f"    {sc_id}: pg={pg_score} recomputed={new_score}")
+        if len(all_drift) > 10:
+            print(f"    ... and {len(all_drift) - 10} more")
+
     return all_inserted_ids
 
 
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Pooled native ClickHouse connections for the cleanup tooling.
+
+Spawning `clickhouse client` per query pays a process start and a fresh TLS
+handshake every time. This keeps a small pool of persistent clickhouse-driver
+connections per (host, port, user, database) and hands them out per query, so
+threads can share it safely (a single driver Client is not thread-safe).
+
+Callers that can't use the driver (not installed, or disabled) fall back to the
+subprocess client; see cluster_cleanup.ch_query.
+
+Requirements:
+  pip install clickhouse-driver
+
+Created: 2026-10-19
+"""
+
+import queue
+import re
+import threading
+from contextlib import contextmanager
+
+try:
+    from clickhouse_driver import Client as CHClient
+    from clickhouse_driver import errors as ch_errors
+except ImportError:  # subprocess fallback only
+    CHClient = None
+    ch_errors = None
+
+DEFAULT_POOL_SIZE = 8
+SEND_RECEIVE_TIMEOUT = 300  # seconds, matches the subprocess query timeout
+
+_pools: dict[tuple, "CHPool"] = {}
+_pools_lock = threading.Lock()
+
+
+def native_available() -> bool:
+    return CHClient is not None
+
+
+class CHPool:
+    """Bounded pool of persistent native connections to one ClickHouse endpoint."""
+
+    def __init__(self, host: str, port: int, user: str, password: str,
+                 database: str = "", secure: bool = True, size: int = DEFAULT_POOL_SIZE):
+        if CHClient is None:
+            raise RuntimeError("clickhouse-driver is not installed")
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.database = database
+        self.secure = secure
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._all: list = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        client = CHClient(
+            host=self.host, port=self.port, user=self.user, password=self.password,
+            database=self.database or "default", secure=self.secure, verify=False,
+            send_receive_timeout=SEND_RECEIVE_TIMEOUT,
+        )
+        with self._lock:
+            self._all.append(client)
+        return client
+
+    def _discard(self, client):
+        try:
+            client.disconnect()
+        except Exception:
+            pass
+        with self._lock:
+            if client in self._all:
+                self._all.remove(client)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection; broken connections are dropped instead of returned."""
+        self._slots.acquire()
+        try:
+            try:
+                client = self._idle.get_nowait()
+            except queue.Empty:
+                client = self._connect()
+            try:
+                yield client
+            except (ch_errors.NetworkError, ch_errors.SocketTimeoutError, EOFError, OSError):
+                self._discard(client)
+                raise
+            except ch_errors.Error:
+                # Server-side error (bad query etc.) - the connection itself is fine
+                self._idle.put(client)
+                raise
+            except BaseException:
+                self._discard(client)
+                raise
+            else:
+                self._idle.put(client)
+        finally:
+            self._slots.release()
+
+    def execute(self, query: str, params: dict = None) -> list[tuple]:
+        with self.connection() as client:
+            return client.execute(query, params)
+
+    def close(self):
+        with self._lock:
+            clients = list(self._all)
+            self._all.clear()
+        for client in clients:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+
+def get_pool(host: str, port: int, user: str, password: str,
+             database: str = "", secure: bool = True, size: int = DEFAULT_POOL_SIZE) -> CHPool:
+    """Return the shared pool for an endpoint, creating it on first use."""
+    key = (host, port, user, password, database, secure)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = CHPool(host, port, user, password, database, secure, size)
+            _pools[key] = pool
+        return pool
+
+
+def close_all():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+# Statements that can be sent again safely if the connection drops mid-query
+READ_ONLY_PREFIX = re.compile(r"^\s*(SELECT|WITH|SHOW|DESCRIBE|DESC|EXISTS|EXPLAIN)\b", re.IGNORECASE)
+
+
+def is_read_only(query: str) -> bool:
+    """True for queries that can't change data (after leading `--` / `/* */` comments)."""
+    query = re.sub(r"^(\s*(--[^\n]*\n|/\*.*?\*/))*", "", query, flags=re.DOTALL)
+    return bool(READ_ONLY_PREFIX.match(query))
+
+
+def is_connection_error(exc: Exception) -> bool:
+    """True for errors where retrying over another transport may help."""
+    if ch_errors is None:
+        return False
+    return isinstance(exc, (ch_errors.NetworkError, ch_errors.SocketTimeoutError, EOFError, OSError))
+
+
+def format_tsv(rows: list[tuple]) -> str:
+    """Render driver rows like `clickhouse client` TSV output (what ch_query callers parse)."""
+    return "\n".join("\t".join(_tsv_value(v) for v in row) for row in rows)
+
+
+# Escapes ClickHouse applies to strings in TabSeparated output
+_TSV_ESCAPES = {
+    "\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r",
+    "\0": "\\0", "\b": "\\b", "\f": "\\f", "'": "\\'",
+}
+_TSV_ESCAPE_RE = re.compile("[\\\\\t\n\r\0\b\f']")
+
+
+def _escape(text: str) -> str:
+    return _TSV_ESCAPE_RE.sub(lambda m: _TSV_ESCAPES[m.group()], text)
+
+
+def _tsv_value(val) -> str:
+    if val is None:
+        return "\\N"
+    if isinstance(val, bool):
+        return "1" if val else "0"
+    if isinstance(val, str):
+        return _escape(val)
+    if isinstance(val, (list, tuple)):
+        # Array elements are written quoted, as in `['a','b']`
+        return "[" + ",".join(f"'{_escape(v)}'" if isinstance(v, str) else _tsv_value(v) for v in val) + "]"
+    return str(val)
@@ -4,33 +4,49 @@ Appeal scorecard cleanup orchestration - per cluster.
 
 Discovers all customer databases on a ClickHouse cluster, deletes appeal scorecard
 data from ClickHouse, waits for mutations, then runs backfill for each customer.
-Processes customers in batches of 10 with JSON-based progress tracking.
+Runs up to --concurrency customers at a time through the pipeline, with separate
+limits on concurrent delete mutations and reindex workflows, and JSON-based
+progress tracking (tracking/<cluster>.json snapshot plus an append-only
+<cluster>.journal.jsonl of per-customer updates, see tracking_journal.py).
 
 Usage:
     python3 cluster_cleanup.py <cluster> <ch_host> <ch_password>
+    python3 cluster_cleanup.py <cluster> <ch_host> <ch_password> --concurrency 4 --max-mutations 2 --max-workflows 3
     python3 cluster_cleanup.py <cluster> --status
     python3 cluster_cleanup.py <cluster> --reset <customer>
+    python3 cluster_cleanup.py --clusters voice-prod,chat-prod,us-east-1-prod
+    python3 cluster_cleanup.py --clusters voice-prod,chat-prod --status
 
 Prerequisites:
     - VPN connected
     - kubectl access to <cluster>_dev
     - temporal CLI installed
-    - clickhouse client at /opt/homebrew/bin/clickhouse
+    - clickhouse-driver (pip install clickhouse-driver) for pooled native connections,
+      or clickhouse client at /opt/homebrew/bin/clickhouse (--ch-transport subprocess)
 
 Created: 2026-02-20
 """
 
 import argparse
+import base64
+import heapq
 import json
 import os
+import re
 import signal
+import socket
 import subprocess
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import ch_pool
+from prefixed_stdout import PrefixedStdout, get_log_prefix, set_log_prefix
+from tracking_journal import TrackingJournal
+
 # ---- Config ----
 
 SCRIPT_DIR = Path(__file__).parent
@@ -41,25 +57,70 @@ BACKFILL_TRACKING = SCRIPT_DIR / "jan-2026-all-clusters" / "backfill_tracking.js
 CH_CLIENT = "/opt/homebrew/bin/clickhouse"
 CH_PORT = 9440
 CH_USER = "admin"
+CH_SECURE = True
+CH_POOL_SIZE = 8
+
+# "native" = pooled clickhouse-driver connections (falls back to subprocess if the
+# driver is missing or the connection breaks); "subprocess" = one client process per query
+CH_TRANSPORT = "native"
+
+# "parts" = answer from system.parts metadata, scanning only edge partitions;
+# "scan" = full count() per database and table
+COUNT_MODE = "parts"
+COUNT_WORKERS = 8
+
+# "auto" = DROP PARTITION / lightweight DELETE / mutation chosen per partition from
+# system.parts; "mutation" = one ALTER ... DELETE per table
+DELETE_STRATEGY = "auto"
+LIGHTWEIGHT_MAX_FRACTION = 0.5  # max share of a partition in the window for lightweight DELETE
+LIGHTWEIGHT_BYTES_PER_ROW = 1   # lightweight DELETE writes a UInt8 _row_exists mask per row
+CLUSTER_PARTS = "clusterAllReplicas('conversations', system.parts)"
+
+# "delete" = delete live data, then backfill; "swap" = backfill, then rebuild the
+# window's partitions in staging tables and swap them in with REPLACE PARTITION
+CLEANUP_MODE = "delete"
 
 DATE_START = "2026-01-01"
 DATE_END = "2026-02-21"
 
-BATCH_SIZE = 10
+# Customers processed at once; delete/mutation and backfill stages have their own limits
+CONCURRENCY = 4
+MAX_CONCURRENT_MUTATIONS = 2
+MAX_CONCURRENT_WORKFLOWS = 3
 MUTATION_POLL_INTERVAL = 10  # seconds
+MUTATION_POLL_MAX_INTERVAL = 60  # backoff cap while nothing changes
 MUTATION_TIMEOUT = 600  # 10 minutes
 WORKFLOW_DISCOVERY_WAIT = 15  # seconds after job creation
 WORKFLOW_POLL_INTERVAL = 30  # seconds
 WORKFLOW_TIMEOUT = 3600  # 1 hour per customer
 
-# Large customers that need 1-day sequential splits
-LARGE_CUSTOMERS = {"cvs", "oportun"}
+# "lpt" = longest estimated duration first; "name" = alphabetical
+PLAN_ORDER = "lpt"
+# Duration model before any customer has completed: overhead + rows / rate
+DEFAULT_CUSTOMER_OVERHEAD = 300  # seconds (mutation wait, job + workflow discovery)
+DEFAULT_ROWS_PER_SECOND = 2000
+
+# Backfill window sizing: days per job are chosen so a job covers about this many
+# scorecard+score rows (Feb 2026: ~20M-row full-range jobs hit heartbeat timeouts,
+# ~1M-row single days of cvs/oportun went through). A window whose workflows fail
+# or time out is halved and retried, down to MIN_WINDOW_DAYS.
+TARGET_ROWS_PER_WINDOW = 5_000_000
+MIN_WINDOW_DAYS = 1
 
 # Customers to skip (already completed)
 SKIP_CUSTOMERS = {"mutualofomaha"}
 
+# --clusters mode: ClickHouse endpoint per cluster. CH_HOST_<CLUSTER> / CH_PASSWORD_<CLUSTER>
+# (e.g. CH_PASSWORD_VOICE_PROD) override; otherwise the host follows the template and the
+# password is read from the cluster's clickhouse-cluster secret
+CH_HOST_TEMPLATE = "clickhouse-conversations.{cluster}.internal.cresta.ai"
+CLUSTER_PROGRESS_INTERVAL = 300  # seconds between combined progress tables
+
 TEMPORAL_NS = "ingestion"
-TEMPORAL_ADDR = "localhost:7233"
+TEMPORAL_PORT = 7233  # Temporal frontend port; the local side is picked per cluster
+TEMPORAL_ADDR = "localhost:7233"  # default for the helpers when called without a forward
+PORT_FORWARD_READY_TIMEOUT = 30  # seconds to wait for the local port to accept connections
+PORT_FORWARD_START_ATTEMPTS = 3
 
 # System databases to exclude
 SYSTEM_DBS = {
@@ -85,14 +146,33 @@ def run(cmd: list[str], timeout: int = 120) -> tuple[int, str, str]:
 
 
 def ch_query(host: str, password: str, query: str, database: str = "") -> str:
-    """Execute a ClickHouse query and return stdout."""
+    """Execute a ClickHouse query and return its TSV output (as `clickhouse client` prints it)."""
+    if CH_TRANSPORT == "native" and ch_pool.native_available():
+        pool = ch_pool.get_pool(host, CH_PORT, CH_USER, password, database,
+                                secure=CH_SECURE, size=CH_POOL_SIZE)
+        try:
+            return ch_pool.format_tsv(pool.execute(query)).strip()
+        except Exception as e:
+            if not ch_pool.is_connection_error(e):
+                raise RuntimeError(f"ClickHouse query failed: {e}") from e
+            if not ch_pool.is_read_only(query):
+                # The statement may already have been applied; don't submit it twice
+                raise RuntimeError(f"ClickHouse connection failed during a write "
+                                   f"(may or may not have been applied): {e}") from e
+            print(f"    WARNING: native ClickHouse connection failed ({e}), retrying via client subprocess")
+    return ch_query_subprocess(host, password, query, database)
+
+
+def ch_query_subprocess(host: str, password: str, query: str, database: str = "") -> str:
+    """Execute a ClickHouse query through a `clickhouse client` process and return stdout."""
     cmd = [
         CH_CLIENT, "client",
         "-h", host, "--port", str(CH_PORT),
         "-u", CH_USER, "--password", password,
-        "--secure",
         "--query", query,
     ]
+    if CH_SECURE:
+        cmd.append("--secure")
     if database:
         cmd.extend(["-d", database])
     rc, stdout, stderr = run(cmd, timeout=300)
@@ -107,20 +187,35 @@ def tracking_path(cluster: str) -> Path:
     return TRACKING_DIR / f"{cluster}.json"
 
 
+# Serializes tracking updates and saves across concurrently processed customers
+TRACKING_LOCK = threading.RLock()
+
+_journals: dict[str, TrackingJournal] = {}
+
+
+def tracking_journal(cluster: str) -> TrackingJournal:
+    """Per-cluster journal: tracking/<cluster>.json snapshot + <cluster>.journal.jsonl."""
+    with TRACKING_LOCK:
+        if cluster not in _journals:
+            _journals[cluster] = TrackingJournal(tracking_path(cluster))
+        return _journals[cluster]
+
+
 def load_tracking(cluster: str) -> dict:
-    path = tracking_path(cluster)
-    if path.exists():
-        with open(path) as f:
-            return json.load(f)
-    return None
+    """Snapshot with any journaled updates replayed (None if not initialized)."""
+    return tracking_journal(cluster).load()
 
 
 def save_tracking(tracking: dict):
-    cluster = tracking["cluster"]
-    path = tracking_path(cluster)
-    TRACKING_DIR.mkdir(parents=True, exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(tracking, f, indent=2)
+    """Write a full snapshot. Per-customer changes go through update_customer instead."""
+    with TRACKING_LOCK:
+        tracking_journal(tracking["cluster"]).save(tracking)
+
+
+def update_customer(tracking: dict, customer_id: str, **fields):
+    """Atomically update a customer's tracking fields and journal the change."""
+    with TRACKING_LOCK:
+        tracking_journal(tracking["cluster"]).update(tracking, ("customers", customer_id), **fields)
 
 
 def init_tracking(cluster: str, ch_host: str, customers: dict[str, dict]) -> dict:
@@ -150,7 +245,6 @@ def init_tracking(cluster: str, ch_host: str, customers: dict[str, dict]) -> dic
 
 def sanitize_database_name(name: str) -> str:
     """Replicate go-servers SanitizeDatabaseName: replace non-alphanumeric (except _) with _."""
-    import re
     return re.sub(r"[^a-zA-Z0-9_]", "_", name)
 
 
@@ -178,13 +272,64 @@ def load_customer_profiles(cluster: str) -> dict[str, list[str]]:
     return dict(customers)
 
 
+def window_filter() -> str:
+    return f"scorecard_time >= '{DATE_START}' AND scorecard_time < '{DATE_END}'"
+
+
+def count_by_database(ch_host: str, ch_password: str, databases: list[str], table: str) -> dict[str, int]:
+    """
+    Count rows in the date window of {db}.{table} for many databases with one query.
+
+    Reads all databases through a merge() table function and groups by the
+    _database virtual column. Databases without rows in the window are absent
+    from the result. Falls back to one count() per database if the merge query fails.
+    """
+    if not databases:
+        return {}
+
+    # Sanitized database names only contain [a-zA-Z0-9_], no regexp escaping needed
+    db_regexp = "^(" + "|".join(sorted(databases)) + ")$"
+    try:
+        result = ch_query(ch_host, ch_password,
+            f"SELECT _database, count() FROM merge(REGEXP('{db_regexp}'), '^{table}$') "
+            f"WHERE {window_filter()} GROUP BY _database"
+        )
+    except RuntimeError as e:
+        print(f"  WARNING: merge() count on {table} failed ({e}), counting per database")
+        return count_by_database_serial(ch_host, ch_password, databases, table)
+
+    counts = {}
+    for line in result.split("\n"):
+        if not line.strip():
+            continue
+        db, count = line.split("\t")
+        counts[db] = int(count)
+    return counts
+
+
+def count_by_database_serial(ch_host: str, ch_password: str, databases: list[str], table: str) -> dict[str, int]:
+    """One count() per database (slow path)."""
+    counts = {}
+    for db in databases:
+        try:
+            count = int(ch_query(ch_host, ch_password,
+                f"SELECT count() FROM {db}.{table} WHERE {window_filter()}"
+            ) or "0")
+        except (RuntimeError, ValueError):
+            count = 0
+        if count:
+            counts[db] = count
+    return counts
+
+
 def discover_databases(ch_host: str, ch_password: str, cluster: str) -> dict[str, dict]:
     """
     Discover all databases with scorecard data, grouped by customer ID.
 
     Uses the customer/profile mapping from backfill_tracking.json to build
     database names via SanitizeDatabaseName(customer + "_" + profile), then
-    checks which databases actually have data in the date range.
+    checks which databases actually have data in the date range. Counts for
+    all databases come from two grouped queries (scorecard, score).
 
     Returns: {customer_id: {"databases": [...], "counts": {"scorecard": N, "score": N}}}
     """
@@ -203,31 +348,24 @@ def discover_databases(ch_host: str, ch_password: str, cluster: str) -> dict[str
     existing_dbs = set(db.strip() for db in existing_dbs_raw.split("\n") if db.strip()) if existing_dbs_raw else set()
     print(f"  {len(existing_dbs)} databases with scorecard tables on cluster")
 
+    started = time.time()
+    sc_counts = count_by_database(ch_host, ch_password, sorted(existing_dbs), "scorecard")
+    score_counts = count_by_database(ch_host, ch_password, sorted(existing_dbs), "score")
+    print(f"  Counted {len(existing_dbs)} databases in {time.time() - started:.1f}s")
+
     # Map customer -> databases with data
     customers: dict[str, dict] = {}
+    mapped_dbs = set()
 
     for customer_id, profiles in sorted(customer_profiles.items()):
         for profile in profiles:
             db = sanitize_database_name(f"{customer_id}_{profile}")
             if db not in existing_dbs:
                 continue
+            mapped_dbs.add(db)
 
-            try:
-                sc_count = int(ch_query(ch_host, ch_password,
-                    f"SELECT count() FROM {db}.scorecard "
-                    f"WHERE scorecard_time >= '{DATE_START}' AND scorecard_time < '{DATE_END}'"
-                ) or "0")
-            except (RuntimeError, ValueError):
-                sc_count = 0
-
-            try:
-                score_count = int(ch_query(ch_host, ch_password,
-                    f"SELECT count() FROM {db}.score "
-                    f"WHERE scorecard_time >= '{DATE_START}' AND scorecard_time < '{DATE_END}'"
-                ) or "0")
-            except (RuntimeError, ValueError):
-                score_count = 0
-
+            sc_count = sc_counts.get(db, 0)
+            score_count = score_counts.get(db, 0)
             if sc_count == 0 and score_count == 0:
                 continue
 
@@ -243,29 +381,13 @@ def discover_databases(ch_host: str, ch_password: str, cluster: str) -> dict[str
             print(f"  {db}: scorecard={sc_count}, score={score_count} (customer={customer_id})")
 
     # Check for databases on ClickHouse not covered by the tracking file
-    mapped_dbs = set()
-    for info in customers.values():
-        mapped_dbs.update(info["databases"])
-    unmapped = existing_dbs - mapped_dbs
-    # Filter unmapped to only those with data
-    if unmapped:
-        unmapped_with_data = []
-        for db in sorted(unmapped):
-            try:
-                sc = int(ch_query(ch_host, ch_password,
-                    f"SELECT count() FROM {db}.scorecard "
-                    f"WHERE scorecard_time >= '{DATE_START}' AND scorecard_time < '{DATE_END}'"
-                ) or "0")
-            except (RuntimeError, ValueError):
-                sc = 0
-            if sc > 0:
-                unmapped_with_data.append(db)
-        if unmapped_with_data:
-            print(f"\n  WARNING: {len(unmapped_with_data)} database(s) with data not in tracking file:")
-            for db in unmapped_with_data:
-                print(f"    {db}")
-            print("  These may be new customers added after the Jan 2026 backfill.")
-            print("  To include them, add their customer/profile to the tracking file or handle manually.")
+    unmapped_with_data = sorted(db for db in existing_dbs - mapped_dbs if sc_counts.get(db, 0) > 0)
+    if unmapped_with_data:
+        print(f"\n  WARNING: {len(unmapped_with_data)} database(s) with data not in tracking file:")
+        for db in unmapped_with_data:
+            print(f"    {db}")
+        print("  These may be new customers added after the Jan 2026 backfill.")
+        print("  To include them, add their customer/profile to the tracking file or handle manually.")
 
     print(f"\n  {len(customers)} customers with data")
     return customers
@@ -273,111 +395,791 @@ def discover_databases(ch_host: str, ch_password: str, cluster: str) -> dict[str
 
 # ---- ClickHouse Delete ----
 
-def delete_ch_data(ch_host: str, ch_password: str, databases: list[str]) -> None:
-    """Delete scorecard and score data from all databases for a customer."""
+def delete_ch_data(ch_host: str, ch_password: str, databases: list[str], strategy: str = None) -> None:
+    """Delete scorecard and score data in the date window from all databases for a customer."""
+    strategy = strategy or DELETE_STRATEGY
+    if strategy == "auto":
+        try:
+            plan = plan_deletes(ch_host, ch_password, databases)
+        except (RuntimeError, ValueError) as e:
+            print(f"    WARNING: Could not read partition metadata ({e}), using full mutations")
+            plan = None
+        if plan is not None:
+            print_delete_plan(plan)
+            execute_delete_plan(ch_host, ch_password, plan)
+            return
+
     for db in databases:
         for table in ["scorecard", "score"]:
             print(f"    Deleting from {db}.{table}...")
             try:
-                ch_query(ch_host, ch_password,
-                    f"ALTER TABLE {db}.{table} ON CLUSTER 'conversations' "
-                    f"DELETE WHERE scorecard_time >= '{DATE_START}' "
-                    f"AND scorecard_time < '{DATE_END}' "
-                    f"SETTINGS replication_wait_for_inactive_replica_timeout = 0"
-                )
+                delete_mutation(ch_host, ch_password, db, table)
             except RuntimeError as e:
                 print(f"    WARNING: Delete failed for {db}.{table}: {e}")
                 raise
 
 
-def wait_for_mutations(ch_host: str, ch_password: str, databases: list[str]) -> None:
-    """Wait for all pending mutations to complete in the given databases."""
-    db_list = ", ".join(f"'{db}'" for db in databases)
+def delete_mutation(ch_host: str, ch_password: str, db: str, table: str, partition_id: str = "") -> None:
+    """Heavyweight ALTER ... DELETE: rewrites every part it touches."""
+    in_partition = f"IN PARTITION ID '{partition_id}' " if partition_id else ""
+    ch_query(ch_host, ch_password,
+        f"ALTER TABLE {db}.{table} ON CLUSTER 'conversations' "
+        f"DELETE {in_partition}WHERE {window_filter()} "
+        f"SETTINGS replication_wait_for_inactive_replica_timeout = 0"
+    )
 
-    elapsed = 0
-    while elapsed < MUTATION_TIMEOUT:
-        result = ch_query(ch_host, ch_password,
-            f"SELECT database, table, mutation_id "
-            f"FROM system.mutations "
-            f"WHERE database IN ({db_list}) AND is_done = 0"
-        )
-        if not result:
-            print("    All mutations completed.")
-            return
 
-        pending = len(result.strip().split("\n"))
-        print(f"    [{elapsed}s] {pending} mutation(s) still running...")
-        time.sleep(MUTATION_POLL_INTERVAL)
-        elapsed += MUTATION_POLL_INTERVAL
+def delete_lightweight(ch_host: str, ch_password: str, db: str, table: str, partition_id: str) -> None:
+    """Lightweight DELETE FROM: only writes the _row_exists mask, rows go away on merge."""
+    ch_query(ch_host, ch_password,
+        f"DELETE FROM {db}.{table} ON CLUSTER 'conversations' "
+        f"IN PARTITION ID '{partition_id}' WHERE {window_filter()} "
+        f"SETTINGS replication_wait_for_inactive_replica_timeout = 0"
+    )
+
+
+def drop_partition(ch_host: str, ch_password: str, db: str, table: str, partition_id: str) -> None:
+    """Drop a partition whose rows all lie in the window: metadata-only, nothing rewritten."""
+    ch_query(ch_host, ch_password,
+        f"ALTER TABLE {db}.{table} ON CLUSTER 'conversations' "
+        f"DROP PARTITION ID '{partition_id}' "
+        f"SETTINGS replication_wait_for_inactive_replica_timeout = 0"
+    )
 
-    raise RuntimeError(f"Mutations did not complete within {MUTATION_TIMEOUT}s")
 
+def window_overlap(info: dict) -> float:
+    """Estimated fraction of a partition's rows in the window, from its time range."""
+    start = datetime.strptime(DATE_START, "%Y-%m-%d")
+    end = datetime.strptime(DATE_END, "%Y-%m-%d")
+    span = (info["max_time"] - info["min_time"]).total_seconds()
+    if span <= 0:
+        return 1.0
+    overlap = (min(info["max_time"], end) - max(info["min_time"], start)).total_seconds()
+    return max(0.0, min(1.0, overlap / span))
 
-def count_ch_data(ch_host: str, ch_password: str, databases: list[str]) -> dict[str, int]:
-    """Count scorecard and score rows across all databases."""
-    total_sc = 0
-    total_score = 0
+
+def replica_count(ch_host: str, ch_password: str) -> int:
+    """Replicas per shard of the 'conversations' cluster (clusterAllReplicas sums over all of them)."""
+    result = ch_query(ch_host, ch_password,
+        "SELECT max(replica_num) FROM system.clusters WHERE cluster = 'conversations'"
+    )
+    try:
+        return max(1, int(result.strip() or 1))
+    except ValueError:
+        return 1
+
+
+def plan_deletes(ch_host: str, ch_password: str, databases: list[str]) -> list[dict]:
+    """
+    Pick the cheapest delete for each partition touching the window.
+
+    Uses cluster-wide part metadata, so a partition only counts as covered if it
+    is covered on every shard and replica:
+      - drop:        every row is in the window -> DROP PARTITION (0 bytes rewritten)
+      - lightweight: window covers at most LIGHTWEIGHT_MAX_FRACTION of the partition
+                     -> DELETE FROM (writes a LIGHTWEIGHT_BYTES_PER_ROW mask per row)
+      - mutation:    thick slices, or tables not partitioned on scorecard_time
+                     -> ALTER ... DELETE (rewrites the partition's parts)
+
+    Rows/bytes are per copy of the data (cluster-wide sums divided by the replica
+    count), so every strategy's cost is in the same unit.
+
+    Returns a list of {"db", "table", "partition_id", "action", "rows", "bytes", "cost"}
+    where cost is the estimated bytes rewritten; partition_id is "" for a whole-table mutation.
+    """
+    partitions = fetch_partitions(ch_host, ch_password, databases, source=CLUSTER_PARTS)
+    replicas = replica_count(ch_host, ch_password)
+    start = datetime.strptime(DATE_START, "%Y-%m-%d")
+    end = datetime.strptime(DATE_END, "%Y-%m-%d")
+
+    plan = []
     for db in databases:
+        for table in ("scorecard", "score"):
+            table_parts = partitions.get((db, table))
+            if table_parts is None:
+                plan.append({"db": db, "table": table, "partition_id": "", "action": "mutation",
+                             "rows": None, "bytes": None, "cost": None})
+                continue
+            for partition_id, info in sorted(table_parts.items()):
+                if classify_partition(info) == "outside":
+                    continue
+                rows = info["rows"] // replicas
+                size = info["bytes"] // replicas
+                entry = {"db": db, "table": table, "partition_id": partition_id,
+                         "rows": rows, "bytes": size}
+                if info["min_time"] >= start and info["max_time"] < end:
+                    entry.update(action="drop", cost=0)
+                elif window_overlap(info) <= LIGHTWEIGHT_MAX_FRACTION:
+                    entry.update(action="lightweight", cost=rows * LIGHTWEIGHT_BYTES_PER_ROW)
+                else:
+                    entry.update(action="mutation", cost=size)
+                plan.append(entry)
+    return plan
+
+
+def format_bytes(n: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if abs(n) < 1024 or unit == "TiB":
+            return f"{n:.1f} {unit}" if unit != "B" else f"{n} B"
+        n /= 1024
+
+
+def print_delete_plan(plan: list[dict]) -> None:
+    print(f"    Delete plan ({len(plan)} step(s)):")
+    for step in plan:
+        target = f"{step['db']}.{step['table']}"
+        if step["partition_id"]:
+            target += f" partition {step['partition_id']}"
+        cost = "unknown" if step["cost"] is None else format_bytes(step["cost"])
+        print(f"      {step['action']:<12s} {target}  (est. rewrite {cost})")
+
+    known = [s for s in plan if s["cost"] is not None]
+    total = sum(s["cost"] for s in known)
+    full_mutation = sum(s["bytes"] for s in known)
+    unknown = len(plan) - len(known)
+    print(f"    Estimated bytes rewritten per replica: {format_bytes(total)} "
+          f"(full mutation would rewrite {format_bytes(full_mutation)})"
+          + (f", plus {unknown} whole-table mutation(s) of unknown size" if unknown else ""))
+
+
+def execute_delete_plan(ch_host: str, ch_password: str, plan: list[dict]) -> None:
+    for step in plan:
+        db, table, partition_id = step["db"], step["table"], step["partition_id"]
+        target = f"{db}.{table}" + (f" partition {partition_id}" if partition_id else "")
+        print(f"    {step['action'].capitalize()}: {target}...")
         try:
-            sc = int(ch_query(ch_host, ch_password,
-                f"SELECT count() FROM {db}.scorecard "
-                f"WHERE scorecard_time >= '{DATE_START}' AND scorecard_time < '{DATE_END}'"
-            ) or "0")
-        except (RuntimeError, ValueError):
-            sc = 0
+            if step["action"] == "drop":
+                drop_partition(ch_host, ch_password, db, table, partition_id)
+            elif step["action"] == "lightweight":
+                try:
+                    delete_lightweight(ch_host, ch_password, db, table, partition_id)
+                except RuntimeError as e:
+                    # e.g. tables with projections reject lightweight deletes
+                    print(f"    Lightweight delete failed ({e}), falling back to mutation")
+                    delete_mutation(ch_host, ch_password, db, table, partition_id)
+            else:
+                delete_mutation(ch_host, ch_password, db, table, partition_id)
+        except RuntimeError as e:
+            print(f"    WARNING: Delete failed for {target}: {e}")
+            raise
+
+
+# ---- Mutation tracking ----
+
+class MutationWatch:
+    """One customer's delete mutations, as seen by MutationTracker."""
+
+    def __init__(self, key: str, databases: list[str], since: str, on_done=None):
+        self.key = key
+        self.databases = set(databases)
+        self.since = since  # only mutations created at/after this CH server time are ours
+        self.on_done = on_done
+        self.started = time.time()
+        self.pending = None
+        self.ok = False
+        self.error = ""
+        self._done = threading.Event()
+
+    def finish(self, ok: bool, error: str = ""):
+        if self._done.is_set():
+            return
+        self.ok = ok
+        self.error = error
+        self._done.set()
+        if self.on_done:
+            # A failing callback must not take the tracker (and every other watch) down
+            try:
+                self.on_done(self.key, ok, error)
+            except Exception as e:
+                print(f"    WARNING: mutation callback for {self.key} failed: {e}")
+
+    def wait(self) -> tuple[bool, str]:
+        self._done.wait()
+        return self.ok, self.error
+
+
+class MutationTracker:
+    """
+    Watches delete mutations for many customers with one system.mutations query per poll.
+
+    Each customer registers the databases it deleted from and the server time just
+    before the delete, so unrelated older mutations on the same databases don't
+    hold it up. The poll interval starts at MUTATION_POLL_INTERVAL, backs off to
+    MUTATION_POLL_MAX_INTERVAL while nothing changes, and resets when a customer
+    finishes.
+    """
+
+    def __init__(self, ch_host: str, ch_password: str):
+        self.ch_host = ch_host
+        self.ch_password = ch_password
+        self._watches: dict[str, MutationWatch] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._log_prefix = get_log_prefix()
+        self._thread = threading.Thread(target=self._loop, name="mutation-tracker", daemon=True)
+        self._thread.start()
+
+    def submit(self, key: str, databases: list[str], delete_fn, on_done=None) -> MutationWatch:
+        """Run delete_fn() (which issues the mutations) and start watching them."""
+        since = ch_now(self.ch_host, self.ch_password)
+        delete_fn()
+        return self.track(key, databases, since, on_done)
+
+    def track(self, key: str, databases: list[str], since: str, on_done=None) -> MutationWatch:
+        watch = MutationWatch(key, databases, since, on_done)
+        with self._lock:
+            running = self._thread.is_alive() and not self._stopped
+            if running:
+                self._watches[key] = watch
+        if not running:
+            watch.finish(False, "Mutation tracker is not running")
+            return watch
+        self._wake.set()
+        return watch
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def _poll(self) -> bool:
+        """One poll for all watched customers. Returns True if any customer finished."""
+        with self._lock:
+            watches = list(self._watches.values())
+        if not watches:
+            return False
+
+        by_db = {db: w for w in watches for db in w.databases}
+        db_list = ", ".join(f"'{db}'" for db in sorted(by_db))
+        result = ch_query(self.ch_host, self.ch_password,
+            f"SELECT database, toString(create_time), latest_fail_reason "
+            f"FROM system.mutations "
+            f"WHERE database IN ({db_list}) AND table IN ('scorecard', 'score') AND is_done = 0"
+        )
+
+        pending: dict[str, int] = {w.key: 0 for w in watches}
+        failures: dict[str, str] = {}
+        for line in result.split("\n"):
+            if not line.strip():
+                continue
+            db, create_time, fail_reason = (line.split("\t") + ["", ""])[:3]
+            watch = by_db.get(db)
+            if watch is None or create_time < watch.since:
+                continue
+            pending[watch.key] += 1
+            if fail_reason and fail_reason != "\\N":
+                failures[watch.key] = fail_reason
+
+        finished = False
+        for watch in watches:
+            count = pending[watch.key]
+            elapsed = int(time.time() - watch.started)
+            if count == 0:
+                self._remove(watch)
+                watch.finish(True)
+                finished = True
+            elif elapsed >= MUTATION_TIMEOUT:
+                self._remove(watch)
+                reason = f" (last failure: {failures[watch.key]})" if watch.key in failures else ""
+                watch.finish(False, f"Mutations did not complete within {MUTATION_TIMEOUT}s{reason}")
+                finished = True
+            elif count != watch.pending:
+                print(f"    [{watch.key}] [{elapsed}s] {count} mutation(s) still running...")
+            watch.pending = count
+        return finished
+
+    def _remove(self, watch: MutationWatch):
+        with self._lock:
+            self._watches.pop(watch.key, None)
+
+    def _loop(self):
+        set_log_prefix(self._log_prefix)
+        interval = MUTATION_POLL_INTERVAL
+        try:
+            while not self._stopped:
+                try:
+                    finished = self._poll()
+                except Exception as e:
+                    print(f"    WARNING: mutation poll failed: {e}")
+                    finished = False
+                interval = MUTATION_POLL_INTERVAL if finished else min(interval * 2, MUTATION_POLL_MAX_INTERVAL)
+                with self._lock:
+                    idle = not self._watches
+                # Sleep until the next poll, or until a new customer registers
+                self._wake.wait(None if idle else interval)
+                if self._wake.is_set():
+                    self._wake.clear()
+                    interval = MUTATION_POLL_INTERVAL
+        finally:
+            # Nobody will poll for these any more; don't leave their waiters blocked
+            with self._lock:
+                self._stopped = True
+                leftover = list(self._watches.values())
+                self._watches.clear()
+            for watch in leftover:
+                watch.finish(False, "Mutation tracker stopped before the mutations finished")
+
+
+def count_ch_data(ch_host: str, ch_password: str, databases: list[str], mode: str = None) -> dict[str, int]:
+    """Count scorecard and score rows in the date window across all databases."""
+    mode = mode or COUNT_MODE
+    if mode == "parts":
         try:
-            score = int(ch_query(ch_host, ch_password,
-                f"SELECT count() FROM {db}.score "
-                f"WHERE scorecard_time >= '{DATE_START}' AND scorecard_time < '{DATE_END}'"
+            return count_ch_data_parts(ch_host, ch_password, databases)
+        except (RuntimeError, ValueError) as e:
+            print(f"    WARNING: system.parts count failed ({e}), falling back to full scans")
+    return count_ch_data_scan(ch_host, ch_password, databases)
+
+
+def count_ch_data_scan(ch_host: str, ch_password: str, databases: list[str]) -> dict[str, int]:
+    """Full count() scan per database and table, run concurrently."""
+    def count_one(db: str, table: str) -> int:
+        try:
+            return int(ch_query(ch_host, ch_password,
+                f"SELECT count() FROM {db}.{table} WHERE {window_filter()}"
             ) or "0")
         except (RuntimeError, ValueError):
-            score = 0
-        total_sc += sc
-        total_score += score
-    return {"scorecard": total_sc, "score": total_score}
+            return 0
+
+    totals = {"scorecard": 0, "score": 0}
+    with ThreadPoolExecutor(max_workers=COUNT_WORKERS) as pool:
+        futures = {
+            pool.submit(count_one, db, table): table
+            for db in databases for table in ("scorecard", "score")
+        }
+        for future in as_completed(futures):
+            totals[futures[future]] += future.result()
+    return totals
+
+
+# ---- Staging rebuild (swap mode) ----
+#
+# Instead of deleting live data and waiting for the reindex to put it back, swap
+# mode backfills first (reindex inserts fresh rows next to the stale ones), then
+# for each partition touching the window rebuilds a copy in a staging table that
+# keeps rows outside the window plus rows written since the backfill started,
+# and swaps it in with REPLACE PARTITION. Live tables never go empty and no
+# delete mutation runs.
+#
+# Stale rows are those with update_time before the backfill started, which only
+# works if reindex stamps update_time at insert time. If it carries PG updated_at
+# instead, every re-inserted row looks stale too; rebuild_table checks that the
+# window has rows newer than the cutoff and refuses to swap otherwise.
+# Assumes {table}_d is the Distributed table over {table}.
+
+def ch_now(ch_host: str, ch_password: str) -> str:
+    """Current ClickHouse server time, to compare against update_time without clock skew."""
+    return ch_query(ch_host, ch_password, "SELECT toString(now())")
+
+
+def fetch_table_engine(ch_host: str, ch_password: str, db: str, table: str) -> tuple[str, str]:
+    """Return (partition_key, engine_full) of a table."""
+    result = ch_query(ch_host, ch_password,
+        f"SELECT partition_key, engine_full FROM system.tables "
+        f"WHERE database = '{db}' AND name = '{table}'"
+    )
+    if not result:
+        raise RuntimeError(f"Table not found: {db}.{table}")
+    partition_key, engine_full = result.split("\t", 1)
+    return partition_key, engine_full
+
+
+def create_staging_tables(ch_host: str, ch_password: str, db: str, table: str) -> None:
+    """
+    Create {table}_staging (same engine, own ZooKeeper path) and {table}_staging_d
+    (Distributed with the live sharding key) on every node.
+    """
+    _, engine_full = fetch_table_engine(ch_host, ch_password, db, table)
+    # First engine argument is the ZooKeeper path; give staging its own
+    staging_engine = re.sub(
+        r"^(\w+)\('[^']*'",
+        lambda m: f"{m.group(1)}('/clickhouse/tables/{{shard}}/{db}/{table}_staging'",
+        engine_full, count=1,
+    )
+    ch_query(ch_host, ch_password,
+        f"CREATE TABLE IF NOT EXISTS {db}.{table}_staging ON CLUSTER 'conversations' "
+        f"AS {db}.{table} ENGINE = {staging_engine}"
+    )
+
+    _, dist_engine = fetch_table_engine(ch_host, ch_password, db, f"{table}_d")
+    staging_dist_engine = dist_engine.replace(f"'{table}'", f"'{table}_staging'", 1)
+    ch_query(ch_host, ch_password,
+        f"CREATE TABLE IF NOT EXISTS {db}.{table}_staging_d ON CLUSTER 'conversations' "
+        f"AS {db}.{table}_d ENGINE = {staging_dist_engine}"
+    )
+
+
+def drop_staging_tables(ch_host: str, ch_password: str, db: str, table: str) -> None:
+    for name in (f"{table}_staging_d", f"{table}_staging"):
+        ch_query(ch_host, ch_password,
+            f"DROP TABLE IF EXISTS {db}.{name} ON CLUSTER 'conversations' SYNC"
+        )
+
+
+def partition_blocks(ch_host: str, ch_password: str, db: str, table: str, partition_id: str) -> dict[str, int]:
+    """Highest block number of a partition per shard (block numbers are allocated per shard)."""
+    result = ch_query(ch_host, ch_password,
+        f"SELECT getMacro('shard'), max(max_block_number) FROM {CLUSTER_PARTS} "
+        f"WHERE active AND database = '{db}' AND table = '{table}' AND partition_id = '{partition_id}' "
+        f"GROUP BY 1"
+    )
+    blocks = {}
+    for line in result.split("\n"):
+        if line.strip():
+            shard, max_block = line.split("\t")
+            blocks[shard] = int(max_block)
+    return blocks
+
+
+def delete_stale_rows(
+    ch_host: str, ch_password: str, db: str, table: str, stale: str, partition_id: str,
+    mutations: "MutationTracker", key: str,
+) -> None:
+    """Lightweight DELETE of the stale rows, waiting for its mutations to finish."""
+    in_partition = f"IN PARTITION ID '{partition_id}' " if partition_id else ""
+    watch = mutations.submit(key, [db], lambda: ch_query(ch_host, ch_password,
+        f"DELETE FROM {db}.{table} ON CLUSTER 'conversations' {in_partition}WHERE {stale} "
+        f"SETTINGS replication_wait_for_inactive_replica_timeout = 0"
+    ))
+    ok, error = watch.wait()
+    if not ok:
+        raise RuntimeError(f"Stale-row delete on {db}.{table} did not complete: {error}")
+
+
+def rebuild_table(
+    ch_host: str, ch_password: str, db: str, table: str, cutoff: str,
+    mutations: "MutationTracker", key: str,
+) -> list[str]:
+    """
+    Rebuild every partition of db.table touching the window and swap it in.
+
+    Returns the partitions where inserts landed between the last pre-swap check
+    and REPLACE PARTITION; those rows were replaced away and need a backfill rerun.
+    """
+    partition_key, _ = fetch_table_engine(ch_host, ch_password, db, table)
+    stale = f"{window_filter()} AND update_time < '{cutoff}'"
+
+    # Without any rows newer than the cutoff, update_time isn't the insert time and
+    # "stale" would match the backfilled data as well
+    stale_rows, fresh_rows = (int(v or 0) for v in (ch_query(ch_host, ch_password,
+        f"SELECT countIf(update_time < '{cutoff}'), countIf(update_time >= '{cutoff}') "
+        f"FROM {db}.{table}_d WHERE {window_filter()}"
+    ).split("\t") + ["0", "0"])[:2])
+    if stale_rows == 0:
+        return []
+    if fresh_rows == 0:
+        raise RuntimeError(
+            f"{db}.{table}: {stale_rows} row(s) in the window but none with update_time >= {cutoff}; "
+            f"update_time doesn't look like insert time, refusing to drop them")
+
+    partitions = fetch_partitions(ch_host, ch_password, [db], (table,), source=CLUSTER_PARTS)
+    table_parts = partitions.get((db, table))
+    if table_parts is None:
+        print(f"    {db}.{table} is not partitioned on scorecard_time, deleting stale rows instead")
+        delete_stale_rows(ch_host, ch_password, db, table, stale, "", mutations, key)
+        return []
+
+    affected = {pid: info for pid, info in sorted(table_parts.items())
+                if classify_partition(info) != "outside"}
+    if not affected:
+        return []
+
+    raced = []
+    ch_query(ch_host, ch_password, f"SYSTEM FLUSH DISTRIBUTED {db}.{table}_d ON CLUSTER 'conversations'")
+    create_staging_tables(ch_host, ch_password, db, table)
+    try:
+        for partition_id, info in affected.items():
+            in_partition = f"({partition_key}) = {info['partition']}"
+            stale_rows = int(ch_query(ch_host, ch_password,
+                f"SELECT count() FROM {db}.{table}_d WHERE {in_partition} AND {stale}"
+            ) or "0")
+            if stale_rows == 0:
+                print(f"    {db}.{table} partition {partition_id}: no stale rows, skipped")
+                continue
+
+            print(f"    {db}.{table} partition {partition_id}: rebuilding "
+                  f"({info['rows']} rows across replicas, {stale_rows} stale)...")
+            ch_query(ch_host, ch_password,
+                f"ALTER TABLE {db}.{table}_staging ON CLUSTER 'conversations' "
+                f"DROP PARTITION ID '{partition_id}'"
+            )
+            before = partition_blocks(ch_host, ch_password, db, table, partition_id)
+            ch_query(ch_host, ch_password,
+                f"INSERT INTO {db}.{table}_staging_d SELECT * FROM {db}.{table}_d "
+                f"WHERE {in_partition} AND NOT ({stale}) "
+                f"SETTINGS insert_distributed_sync = 1"
+            )
+
+            # Rows inserted into the live partition after we copied it would be lost
+            # by the swap; if any arrived, delete just the stale rows instead.
+            if partition_blocks(ch_host, ch_password, db, table, partition_id) != before:
+                print(f"    {db}.{table} partition {partition_id}: live inserts during rebuild, "
+                      f"deleting stale rows instead of swapping")
+                delete_stale_rows(ch_host, ch_password, db, table, stale, partition_id, mutations, key)
+                continue
+
+            ch_query(ch_host, ch_password,
+                f"ALTER TABLE {db}.{table} ON CLUSTER 'conversations' "
+                f"REPLACE PARTITION ID '{partition_id}' FROM {db}.{table}_staging "
+                f"SETTINGS replication_wait_for_inactive_replica_timeout = 0"
+            )
+
+            # REPLACE PARTITION takes exactly one new block number per shard; anything
+            # higher means an insert slipped in after the check above and was dropped
+            after = partition_blocks(ch_host, ch_password, db, table, partition_id)
+            if any(shard not in before or block > before[shard] + 1 for shard, block in after.items()):
+                print(f"    WARNING: {db}.{table} partition {partition_id}: inserts landed during "
+                      f"the swap and were replaced away")
+                raced.append(f"{db}.{table}/{partition_id}")
+            else:
+                print(f"    {db}.{table} partition {partition_id}: swapped")
+    finally:
+        drop_staging_tables(ch_host, ch_password, db, table)
+    return raced
+
+
+# ---- Partition metadata ----
+
+def parse_ch_time(val: str) -> datetime:
+    return datetime.strptime(val[:19], "%Y-%m-%d %H:%M:%S")
+
+
+def fetch_partitions(
+    ch_host: str, ch_password: str, databases: list[str],
+    tables: tuple[str, ...] = ("scorecard", "score"), source: str = "system.parts",
+) -> dict[tuple[str, str], dict[str, dict]]:
+    """
+    Active-part metadata per partition for the given databases/tables, in one query.
+
+    Only tables partitioned on scorecard_time are returned: for those, the parts'
+    min_time/max_time bound the scorecard_time values they hold. Tables with any
+    other partition key are left out (callers must scan them).
+
+    `source` can be a cluster-wide view such as
+    "clusterAllReplicas('conversations', system.parts)".
+
+    Returns: {(db, table): {partition_id: {"partition", "rows", "bytes", "min_time",
+              "max_time", "parts", "max_block", "has_lightweight_delete"}}}
+    """
+    if not databases:
+        return {}
+    db_list = ", ".join(f"'{db}'" for db in databases)
+    table_list = ", ".join(f"'{t}'" for t in tables)
+
+    time_partitioned = set()
+    result = ch_query(ch_host, ch_password,
+        f"SELECT database, name, partition_key FROM system.tables "
+        f"WHERE database IN ({db_list}) AND name IN ({table_list})"
+    )
+    for line in result.split("\n"):
+        if not line.strip():
+            continue
+        db, table, partition_key = line.split("\t", 2)
+        if "scorecard_time" in partition_key:
+            time_partitioned.add((db, table))
+
+    partitions: dict[tuple[str, str], dict[str, dict]] = {key: {} for key in time_partitioned}
+    if not time_partitioned:
+        return partitions
+
+    result = ch_query(ch_host, ch_password,
+        f"SELECT database, table, partition_id, sum(rows), sum(bytes_on_disk), "
+        f"min(min_time), max(max_time), count(), max(has_lightweight_delete), "
+        f"any(partition), max(max_block_number) "
+        f"FROM {source} "
+        f"WHERE active AND database IN ({db_list}) AND table IN ({table_list}) "
+        f"GROUP BY database, table, partition_id"
+    )
+    for line in result.split("\n"):
+        if not line.strip():
+            continue
+        (db, table, partition_id, rows, size, min_time, max_time, parts, has_lwd,
+         partition, max_block) = line.split("\t")
+        if (db, table) not in time_partitioned:
+            continue
+        partitions[(db, table)][partition_id] = {
+            "partition": partition,
+            "rows": int(rows),
+            "bytes": int(size),
+            "min_time": parse_ch_time(min_time),
+            "max_time": parse_ch_time(max_time),
+            "parts": int(parts),
+            "max_block": int(max_block),
+            "has_lightweight_delete": has_lwd in ("1", "true", "True"),
+        }
+    return partitions
+
+
+def classify_partition(info: dict) -> str:
+    """
+    Where a partition's data lies relative to [DATE_START, DATE_END).
+
+    "inside": every row is in the window; "outside": no row is; "edge": some may be.
+    Partitions with lightweight-deleted rows are always "edge" - their row counts
+    still include the masked rows.
+    """
+    start = datetime.strptime(DATE_START, "%Y-%m-%d")
+    end = datetime.strptime(DATE_END, "%Y-%m-%d")
+    if info["max_time"] < start or info["min_time"] >= end:
+        return "outside"
+    if info["min_time"] >= start and info["max_time"] < end and not info["has_lightweight_delete"]:
+        return "inside"
+    return "edge"
+
+
+def count_ch_data_parts(ch_host: str, ch_password: str, databases: list[str]) -> dict[str, int]:
+    """
+    Count rows in the window from system.parts metadata.
+
+    Partitions entirely inside the window are counted from part row counts; only
+    edge partitions are scanned (restricted to those partitions via _partition_id).
+    Tables not partitioned on scorecard_time are scanned in full. Scans for all
+    databases run concurrently.
+    """
+    partitions = fetch_partitions(ch_host, ch_password, databases)
+
+    totals = {"scorecard": 0, "score": 0}
+    scans = []  # (db, table, partition filter or "" for a full scan)
+    for db in databases:
+        for table in ("scorecard", "score"):
+            table_parts = partitions.get((db, table))
+            if table_parts is None:
+                scans.append((db, table, ""))
+                continue
+            edge_ids = []
+            for partition_id, info in table_parts.items():
+                kind = classify_partition(info)
+                if kind == "inside":
+                    totals[table] += info["rows"]
+                elif kind == "edge":
+                    edge_ids.append(partition_id)
+            if edge_ids:
+                id_list = ", ".join(f"'{p}'" for p in sorted(edge_ids))
+                scans.append((db, table, f" AND _partition_id IN ({id_list})"))
+
+    def scan(db: str, table: str, partition_filter: str) -> int:
+        return int(ch_query(ch_host, ch_password,
+            f"SELECT count() FROM {db}.{table} WHERE {window_filter()}{partition_filter}"
+        ) or "0")
+
+    with ThreadPoolExecutor(max_workers=COUNT_WORKERS) as pool:
+        futures = {pool.submit(scan, *args): args[1] for args in scans}
+        for future in as_completed(futures):
+            totals[futures[future]] += future.result()
+    return totals
 
 
 # ---- Port-forward management ----
 
+def free_local_port() -> int:
+    """Ask the OS for an unused local TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def port_open(port: int, timeout: float = 1.0) -> bool:
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
 class PortForward:
-    def __init__(self, cluster: str):
+    """
+    kubectl port-forward to one cluster's Temporal frontend on its own local port.
+
+    Each forward owns its local port and process, so forwards for several clusters
+    can run side by side; stop() only kills this forward's process.
+    """
+
+    def __init__(self, cluster: str, local_port: int = 0):
         self.cluster = cluster
         self.context = f"{cluster}_dev"
+        self.local_port = local_port or free_local_port()
         self.proc = None
+        self._lock = threading.Lock()
+
+    @property
+    def address(self) -> str:
+        return f"localhost:{self.local_port}"
 
     def start(self):
         self.stop()
-        time.sleep(2)
-        self.proc = subprocess.Popen(
-            [
-                "kubectl", f"--context={self.context}", "-n", "temporal",
-                "port-forward", "svc/temporal-frontend-headless", "7233:7233",
-            ],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        time.sleep(5)
-        print(f"  Port-forward started (pid {self.proc.pid})")
+        for attempt in range(PORT_FORWARD_START_ATTEMPTS):
+            self.proc = subprocess.Popen(
+                [
+                    "kubectl", f"--context={self.context}", "-n", "temporal",
+                    "port-forward", "svc/temporal-frontend-headless",
+                    f"{self.local_port}:{TEMPORAL_PORT}",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            if self._wait_ready():
+                print(f"  Port-forward {self.cluster} -> {self.address} (pid {self.proc.pid})")
+                return
+            self.stop()
+            # Most likely the port was taken between picking and binding it
+            self.local_port = free_local_port()
+        raise RuntimeError(f"Port-forward to {self.cluster} Temporal did not become ready")
+
+    def _wait_ready(self) -> bool:
+        """Probe the local port until the forward accepts connections (or the process exits)."""
+        deadline = time.time() + PORT_FORWARD_READY_TIMEOUT
+        while time.time() < deadline:
+            if self.proc.poll() is not None:
+                return False
+            if port_open(self.local_port):
+                return True
+            time.sleep(0.2)
+        return False
 
     def stop(self):
-        subprocess.run(["pkill", "-f", "port-forward.*7233"], capture_output=True)
         if self.proc:
             self.proc.kill()
+            self.proc.wait()
             self.proc = None
 
     def ensure_alive(self):
-        if self.proc is None or self.proc.poll() is not None:
-            print("  Port-forward died, restarting...")
-            self.start()
+        with self._lock:
+            if self.proc is None or self.proc.poll() is not None or not port_open(self.local_port):
+                print(f"  Port-forward {self.cluster} died, restarting...")
+                self.start()
+
+
+class PortForwardManager:
+    """One PortForward per cluster, started on first use and restarted individually."""
+
+    def __init__(self):
+        self._forwards: dict[str, PortForward] = {}
+        self._lock = threading.Lock()
+
+    def get(self, cluster: str) -> PortForward:
+        with self._lock:
+            pf = self._forwards.get(cluster)
+            if pf is None:
+                pf = PortForward(cluster)
+                pf.start()
+                self._forwards[cluster] = pf
+            return pf
+
+    def stop_all(self):
+        with self._lock:
+            forwards = list(self._forwards.values())
+            self._forwards.clear()
+        for pf in forwards:
+            pf.stop()
 
 
 # ---- Temporal helpers ----
 
-def get_workflow_status(workflow_id: str) -> str:
+def get_workflow_status(workflow_id: str, address: str = TEMPORAL_ADDR) -> str:
     rc, stdout, _ = run([
         "temporal", "workflow", "describe",
         "--namespace", TEMPORAL_NS,
-        "--address", TEMPORAL_ADDR,
+        "--address", address,
         "--workflow-id", workflow_id,
         "--output", "json",
     ])
@@ -390,7 +1192,24 @@ def get_workflow_status(workflow_id: str) -> str:
         return "UNKNOWN"
 
 
-def find_recent_workflows(customer_id: str, cluster: str, max_age_minutes: int = 3) -> list[str]:
+def terminate_workflows(workflow_ids: list[str], reason: str, address: str = TEMPORAL_ADDR) -> None:
+    """Terminate workflows still running (e.g. after a wait timeout) before their window is retried."""
+    for wf_id in workflow_ids:
+        rc, _, stderr = run([
+            "temporal", "workflow", "terminate",
+            "--namespace", TEMPORAL_NS,
+            "--address", address,
+            "--workflow-id", wf_id,
+            "--reason", reason,
+        ])
+        # Already-closed workflows reject terminate; that's fine
+        if rc != 0 and "not found" not in stderr.lower() and "completed" not in stderr.lower():
+            print(f"    WARNING: terminate {wf_id} failed: {stderr.strip()}")
+
+
+def find_recent_workflows(
+    customer_id: str, cluster: str, max_age_minutes: int = 3, address: str = TEMPORAL_ADDR
+) -> list[str]:
     """Find running workflows for a customer started within max_age_minutes."""
     # Workflow IDs look like: reindexconversations-<customer>-<cluster>-...
     prefix = f"reindexconversations-{customer_id}-{cluster}"
@@ -398,7 +1217,7 @@ def find_recent_workflows(customer_id: str, cluster: str, max_age_minutes: int =
         [
             "temporal", "workflow", "list",
             "--namespace", TEMPORAL_NS,
-            "--address", TEMPORAL_ADDR,
+            "--address", address,
             "--query",
             f'ExecutionStatus = "Running" AND WorkflowId STARTS_WITH "{prefix}"',
             "--output", "json",
@@ -427,38 +1246,155 @@ def find_recent_workflows(customer_id: str, cluster: str, max_age_minutes: int =
     return result
 
 
-def wait_for_workflows(workflow_ids: list[str], pf: PortForward) -> tuple[bool, str]:
-    """Poll workflows until all are done or timeout."""
-    elapsed = 0
-    while elapsed < WORKFLOW_TIMEOUT:
-        pf.ensure_alive()
+def list_workflow_statuses(workflow_ids: list[str], address: str = TEMPORAL_ADDR) -> dict[str, str]:
+    """
+    Status of many workflows from one visibility query (WorkflowId IN (...)).
+
+    If a workflow ID has several runs, the most recently started one wins.
+    Raises RuntimeError if the list call fails.
+    """
+    id_list = ", ".join(f'"{wf_id}"' for wf_id in workflow_ids)
+    rc, stdout, stderr = run(
+        [
+            "temporal", "workflow", "list",
+            "--namespace", TEMPORAL_NS,
+            "--address", address,
+            "--query", f"WorkflowId IN ({id_list})",
+            "--output", "json",
+        ],
+        timeout=60,
+    )
+    if rc != 0:
+        raise RuntimeError(f"temporal workflow list failed: {stderr.strip()}")
+    try:
+        data = json.loads(stdout) if stdout.strip() else []
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"Failed to parse workflow list: {e}")
+
+    statuses = {}
+    latest_start = {}
+    for wf in data:
+        wf_id = wf.get("execution", {}).get("workflowId", "")
+        start = wf.get("startTime", "")
+        if wf_id and start >= latest_start.get(wf_id, ""):
+            latest_start[wf_id] = start
+            statuses[wf_id] = wf.get("status", "UNKNOWN")
+    return statuses
+
+
+def is_terminal(status: str) -> bool:
+    return status != "UNKNOWN" and "RUNNING" not in status
 
-        all_done = True
-        any_failed = False
-        status_parts = []
 
-        for wf_id in workflow_ids:
-            status = get_workflow_status(wf_id)
-            short = status.split("_")[-1] if "_" in status else status
-            wf_short = wf_id.rsplit("-", 1)[-1][:8] if "-" in wf_id else wf_id[:8]
-            status_parts.append(f"{wf_short}={short}")
+class WorkflowWaiter:
+    """A group of workflows one customer (or one backfill window) is waiting on."""
 
-            if "RUNNING" in status:
-                all_done = False
-            elif "FAILED" in status or "TIMED_OUT" in status or "CANCELED" in status:
-                any_failed = True
+    def __init__(self, workflow_ids: list[str]):
+        self.workflow_ids = list(workflow_ids)
+        self.changed = threading.Condition()
+        self.version = 0
+
+
+class WorkflowMonitor:
+    """
+    Polls the status of every tracked workflow with one `temporal workflow list`
+    query per WORKFLOW_POLL_INTERVAL and pushes changes to waiters.
 
-        if all_done:
-            if any_failed:
-                msg = f"Workflows finished with failures: {', '.join(status_parts)}"
-                return False, msg
-            return True, ""
+    Replaces one `temporal workflow describe` per workflow per poll. Terminal
+    workflows are dropped from later polls. Falls back to describe calls if the
+    list query fails.
+    """
 
-        print(f"    [{elapsed}s] {' | '.join(status_parts)}")
-        time.sleep(WORKFLOW_POLL_INTERVAL)
-        elapsed += WORKFLOW_POLL_INTERVAL
+    LIST_CHUNK = 100  # workflow IDs per visibility query
 
-    return False, f"Timeout after {WORKFLOW_TIMEOUT}s"
+    def __init__(self, pf: PortForward):
+        self.pf = pf
+        self.statuses: dict[str, str] = {}
+        self._waiters: list[WorkflowWaiter] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._log_prefix = get_log_prefix()
+        self._thread = threading.Thread(target=self._loop, name="workflow-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def wait(self, workflow_ids: list[str], timeout: int = WORKFLOW_TIMEOUT) -> tuple[bool, str]:
+        """Block until all workflow_ids are terminal or timeout. Returns (success, error)."""
+        waiter = WorkflowWaiter(workflow_ids)
+        with self._lock:
+            self._waiters.append(waiter)
+        started = time.time()
+        seen = -1
+        try:
+            while True:
+                with waiter.changed:
+                    if waiter.version == seen or waiter.version == 0:
+                        waiter.changed.wait(timeout=max(0.0, timeout - (time.time() - started)))
+                    seen = waiter.version
+                with self._lock:
+                    statuses = [self.statuses.get(wf_id, "UNKNOWN") for wf_id in workflow_ids]
+
+                status_parts = []
+                for wf_id, status in zip(workflow_ids, statuses):
+                    short = status.split("_")[-1] if "_" in status else status
+                    wf_short = wf_id.rsplit("-", 1)[-1][:8] if "-" in wf_id else wf_id[:8]
+                    status_parts.append(f"{wf_short}={short}")
+
+                if all(is_terminal(st) for st in statuses):
+                    if any("FAILED" in st or "TIMED_OUT" in st or "CANCELED" in st
+                           or "TERMINATED" in st for st in statuses):
+                        return False, f"Workflows finished with failures: {', '.join(status_parts)}"
+                    return True, ""
+
+                elapsed = int(time.time() - started)
+                if elapsed >= timeout:
+                    return False, f"Timeout after {timeout}s"
+                print(f"    [{elapsed}s] {' | '.join(status_parts)}")
+        finally:
+            with self._lock:
+                self._waiters.remove(waiter)
+
+    def _poll(self):
+        with self._lock:
+            waiters = list(self._waiters)
+            tracked = sorted({wf_id for w in waiters for wf_id in w.workflow_ids
+                              if not is_terminal(self.statuses.get(wf_id, "UNKNOWN"))})
+        if not tracked:
+            return
+
+        self.pf.ensure_alive()
+        updates = {}
+        for i in range(0, len(tracked), self.LIST_CHUNK):
+            chunk = tracked[i:i + self.LIST_CHUNK]
+            try:
+                listed = list_workflow_statuses(chunk, self.pf.address)
+            except RuntimeError as e:
+                print(f"    WARNING: {e}; falling back to describe")
+                listed = {}
+            # Not visible yet (visibility lag) or list failed: describe individually
+            for wf_id in chunk:
+                if wf_id not in listed:
+                    listed[wf_id] = get_workflow_status(wf_id, self.pf.address)
+            updates.update(listed)
+
+        with self._lock:
+            self.statuses.update(updates)
+        # Wake every waiter after each poll so they report progress and check timeouts
+        for waiter in waiters:
+            with waiter.changed:
+                waiter.version += 1
+                waiter.changed.notify_all()
+
+    def _loop(self):
+        set_log_prefix(self._log_prefix)
+        while not self._stopped.is_set():
+            try:
+                self._poll()
+            except Exception as e:
+                print(f"    WARNING: workflow poll failed: {e}")
+            self._stopped.wait(WORKFLOW_POLL_INTERVAL)
 
 
 # ---- Backfill ----
@@ -480,146 +1416,411 @@ def run_backfill(cluster: str, customer_id: str, start_date: str, end_date: str)
     return stdout.strip().split("\n")[-1]
 
 
-def run_backfill_single_customer(
-    cluster: str, customer_id: str, pf: PortForward
-) -> tuple[bool, str]:
-    """Run backfill for a single customer and wait for completion."""
-    is_large = customer_id in LARGE_CUSTOMERS
-
-    if is_large:
-        return run_backfill_sequential(cluster, customer_id, pf)
-    else:
-        return run_backfill_single(cluster, customer_id, pf)
+def initial_window_days(rows: int, total_days: int) -> int:
+    """Days per backfill job so each job covers about TARGET_ROWS_PER_WINDOW rows."""
+    if rows <= 0 or total_days <= 0:
+        return max(total_days, MIN_WINDOW_DAYS)
+    rows_per_day = rows / total_days
+    return max(MIN_WINDOW_DAYS, min(total_days, int(TARGET_ROWS_PER_WINDOW // rows_per_day)))
 
 
-def run_backfill_single(
-    cluster: str, customer_id: str, pf: PortForward
-) -> tuple[bool, str]:
-    """Run a single backfill job for the full date range."""
-    print(f"    Running backfill: {customer_id} ({DATE_START} to {DATE_END})...")
+def run_backfill_window(
+    cluster: str, customer_id: str, workflows: WorkflowMonitor, start_date: str, end_date: str
+) -> tuple[bool, str, list[str]]:
+    """Run one backfill job for [start_date, end_date) and wait. Returns (success, error, workflow_ids)."""
     try:
-        job_name = run_backfill(cluster, customer_id, DATE_START, DATE_END)
+        job_name = run_backfill(cluster, customer_id, start_date, end_date)
         print(f"    Job: {job_name}")
     except RuntimeError as e:
-        return False, str(e)
+        return False, str(e), []
 
     # Wait for workflows to spawn
     time.sleep(WORKFLOW_DISCOVERY_WAIT)
-    pf.ensure_alive()
+    workflows.pf.ensure_alive()
 
-    workflow_ids = find_recent_workflows(customer_id, cluster)
+    workflow_ids = find_recent_workflows(customer_id, cluster, address=workflows.pf.address)
     if not workflow_ids:
         print("    No running workflows found (may have completed instantly).")
-        return True, ""
+        return True, "", []
 
     print(f"    Found {len(workflow_ids)} workflow(s)")
-    return wait_for_workflows(workflow_ids, pf)
+    success, error = workflows.wait(workflow_ids)
+    return success, error, workflow_ids
 
 
-def run_backfill_sequential(
-    cluster: str, customer_id: str, pf: PortForward
+def run_backfill_adaptive(
+    cluster: str, customer_id: str, workflows: WorkflowMonitor, rows: int
 ) -> tuple[bool, str]:
-    """Run 1-day sequential backfill for large customers (cvs, oportun)."""
+    """
+    Backfill DATE_START..DATE_END in sequential windows sized from the customer's row count.
+
+    When a window's workflows fail or time out, the still-running ones are
+    terminated and the window is split in half and retried; later windows use the
+    smaller size too. A failure at MIN_WINDOW_DAYS (or a job that can't be created)
+    fails the customer.
+    """
     start = datetime.strptime(DATE_START, "%Y-%m-%d")
     end = datetime.strptime(DATE_END, "%Y-%m-%d")
-
     total_days = (end - start).days
-    print(f"    Running sequential backfill: {customer_id} ({total_days} days)...")
+    window_days = initial_window_days(rows, total_days)
 
+    if window_days >= total_days:
+        print(f"    Running backfill: {customer_id} ({DATE_START} to {DATE_END})...")
+    else:
+        print(f"    Running windowed backfill: {customer_id} ({total_days} days, "
+              f"{window_days}-day windows for {rows:,} rows)...")
+
+    # Windows still to run, in date order; a failed window is replaced by its halves
+    windows = []
     current = start
-    day_num = 0
     while current < end:
-        day_num += 1
-        next_day = current + timedelta(days=1)
-        day_start = current.strftime("%Y-%m-%d")
-        day_end = next_day.strftime("%Y-%m-%d")
+        windows.append((current, min(current + timedelta(days=window_days), end)))
+        current = windows[-1][1]
+
+    done_days = 0
+    while windows:
+        w_start, w_end = windows.pop(0)
+        span = (w_end - w_start).days
+        label = f"{w_start:%Y-%m-%d}..{w_end:%Y-%m-%d}"
+        if span < total_days:
+            print(f"    [{done_days}/{total_days} days] {label} ({span}d)...")
+
+        success, error, workflow_ids = run_backfill_window(
+            cluster, customer_id, workflows, f"{w_start:%Y-%m-%d}", f"{w_end:%Y-%m-%d}")
+        if success:
+            done_days += span
+            continue
+        if not workflow_ids or span <= MIN_WINDOW_DAYS:
+            # Job creation failed, or nothing left to split
+            return False, f"{label}: {error}"
+
+        if error.startswith("Timeout"):
+            terminate_workflows(workflow_ids, f"cluster_cleanup: window {label} timed out, splitting",
+                                workflows.pf.address)
+        half = span // 2
+        mid = w_start + timedelta(days=half)
+        print(f"    {label} failed ({error}); retrying as {half}d + {span - half}d windows")
+        windows[:0] = [(w_start, mid), (mid, w_end)]
+
+        # Carry the smaller size forward: re-cut the remaining untouched windows
+        window_days = min(window_days, half)
+        rest = windows[2:]
+        if rest:
+            recut = []
+            current, rest_end = rest[0][0], rest[-1][1]
+            while current < rest_end:
+                recut.append((current, min(current + timedelta(days=window_days), rest_end)))
+                current = recut[-1][1]
+            windows[2:] = recut
 
-        print(f"    [{day_num}/{total_days}] {day_start}...")
-        try:
-            job_name = run_backfill(cluster, customer_id, day_start, day_end)
-        except RuntimeError as e:
-            return False, f"Day {day_start}: {e}"
+    return True, ""
 
-        # Wait for workflows
-        time.sleep(WORKFLOW_DISCOVERY_WAIT)
-        pf.ensure_alive()
 
-        workflow_ids = find_recent_workflows(customer_id, cluster)
-        if workflow_ids:
-            success, error = wait_for_workflows(workflow_ids, pf)
-            if not success:
-                return False, f"Day {day_start}: {error}"
+# ---- Planning ----
 
-        current = next_day
+def parse_iso(val: str) -> datetime:
+    return datetime.strptime(val, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
 
-    return True, ""
+
+def customer_rows(cust: dict) -> int:
+    counts = cust.get("before_counts") or {}
+    return counts.get("scorecard", 0) + counts.get("score", 0)
+
+
+def completion_samples(tracking: dict) -> list[tuple[int, float]]:
+    """
+    (rows, seconds) for every customer with a measured completion, from this
+    cluster's tracking and the other clusters' files in tracking/.
+    """
+    trackings = {tracking["cluster"]: tracking}
+    for path in sorted(TRACKING_DIR.glob("*.json")):
+        if path.stem not in trackings:
+            other = TrackingJournal(path).load()
+            if other and "customers" in other:
+                trackings[path.stem] = other
+
+    samples = []
+    for t in trackings.values():
+        for cust in t["customers"].values():
+            if cust["status"] != "completed" or not cust.get("started_at"):
+                continue
+            try:
+                seconds = (parse_iso(cust["completed_at"]) - parse_iso(cust["started_at"])).total_seconds()
+            except (TypeError, ValueError):
+                continue  # "previously completed" and similar markers
+            if seconds > 0:
+                samples.append((customer_rows(cust), seconds))
+    return samples
+
+
+def fit_duration_model(samples: list[tuple[int, float]]) -> tuple[float, float]:
+    """
+    Least-squares fit of seconds = overhead + rows * seconds_per_row over past completions.
+
+    Returns (overhead_seconds, seconds_per_row). Uses the default overhead with a
+    single sample, and the defaults outright with no history.
+    """
+    default = (DEFAULT_CUSTOMER_OVERHEAD, 1.0 / DEFAULT_ROWS_PER_SECOND)
+    if not samples:
+        return default
+    if len(samples) == 1:
+        rows, seconds = samples[0]
+        overhead = min(seconds, DEFAULT_CUSTOMER_OVERHEAD)
+        if rows <= 0 or seconds <= overhead:
+            return (overhead, default[1])
+        return (overhead, (seconds - overhead) / rows)
+
+    n = len(samples)
+    mean_x = sum(r for r, _ in samples) / n
+    mean_y = sum(s for _, s in samples) / n
+    var_x = sum((r - mean_x) ** 2 for r, _ in samples)
+    if var_x == 0:
+        return (mean_y, default[1])
+    slope = sum((r - mean_x) * (s - mean_y) for r, s in samples) / var_x
+    if slope <= 0:
+        # Row count doesn't explain duration in the history; treat every customer alike
+        return (mean_y, 0.0)
+    return (max(mean_y - slope * mean_x, 0.0), slope)
+
+
+def estimate_durations(tracking: dict, customer_ids: list[str]) -> dict[str, float]:
+    overhead, per_row = fit_duration_model(completion_samples(tracking))
+    return {
+        cid: overhead + customer_rows(tracking["customers"][cid]) * per_row
+        for cid in customer_ids
+    }
+
+
+def simulate_makespan(order: list[str], durations: dict[str, float], slots: int) -> float:
+    """Finish time of list scheduling `order` onto `slots` workers (next free worker takes the next job)."""
+    free_at = [0.0] * max(slots, 1)
+    for cid in order:
+        heapq.heappush(free_at, heapq.heappop(free_at) + durations[cid])
+    return max(free_at)
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    return f"{seconds // 60}m{seconds % 60:02d}s"
+
+
+def plan_order(tracking: dict, pending: list[str], concurrency: int, order: str = None) -> list[str]:
+    """
+    Order pending customers for the scheduler and print the predicted makespan.
+
+    The thread pool hands customers to workers in submission order, so submitting
+    longest-estimated-first is LPT list scheduling: the biggest customers start
+    early instead of stretching the tail when they happen to sort last. Stage
+    limits (--max-mutations/--max-workflows) aren't modeled, so the prediction
+    is a lower bound when they bind.
+    """
+    order = order or PLAN_ORDER
+    durations = estimate_durations(tracking, pending)
+    by_name = sorted(pending)
+    if order == "lpt":
+        planned = sorted(pending, key=lambda cid: (-durations[cid], cid))
+    else:
+        planned = by_name
+
+    makespan = simulate_makespan(planned, durations, concurrency)
+    print(f"Predicted makespan: {format_duration(makespan)} "
+          f"({order} order, {concurrency} slot(s), "
+          f"total work {format_duration(sum(durations.values()))})")
+    if order == "lpt":
+        print(f"  vs {format_duration(simulate_makespan(by_name, durations, concurrency))} in name order")
+    for cid in planned[:5]:
+        print(f"  {cid:30s} ~{format_duration(durations[cid])} "
+              f"({customer_rows(tracking['customers'][cid]):,} rows)")
+    if len(planned) > 5:
+        print(f"  ... (+{len(planned) - 5} more)")
+    return planned
 
 
 # ---- Process one customer ----
 
+class StageLimits:
+    """Caps on how many customers are in each heavy pipeline stage at once."""
+
+    def __init__(self, max_mutations: int, max_workflows: int):
+        self.mutations = threading.BoundedSemaphore(max_mutations)
+        self.workflows = threading.BoundedSemaphore(max_workflows)
+
+
 def process_customer(
     tracking: dict,
     customer_id: str,
     ch_host: str,
     ch_password: str,
     cluster: str,
-    pf: PortForward,
+    workflows: WorkflowMonitor,
+    limits: StageLimits,
+    mutations: MutationTracker,
 ) -> None:
-    """Process a single customer: delete -> wait mutations -> backfill."""
+    """
+    Process a single customer.
+
+    delete mode: delete -> wait mutations -> backfill -> count
+    swap mode:   backfill -> rebuild + swap partitions -> count
+    """
     cust = tracking["customers"][customer_id]
     databases = cust["databases"]
 
     print(f"\n  === {customer_id} ({len(databases)} database(s)) ===")
 
+    if CLEANUP_MODE == "swap":
+        process_customer_swap(tracking, customer_id, ch_host, ch_password, cluster, workflows, limits,
+                              mutations)
+        return
+
     # Mark as deleting
-    cust["status"] = "deleting"
-    cust["started_at"] = now_iso()
-    cust["error"] = None
-    save_tracking(tracking)
+    update_customer(tracking, customer_id, status="deleting", started_at=now_iso(), error=None)
 
     try:
-        # Step 1: Delete from ClickHouse
-        print(f"  Deleting ClickHouse data...")
-        delete_ch_data(ch_host, ch_password, databases)
+        with limits.mutations:
+            # Step 1: Delete from ClickHouse
+            print(f"  Deleting ClickHouse data...")
+            watch = mutations.submit(
+                customer_id, databases,
+                lambda: delete_ch_data(ch_host, ch_password, databases),
+                on_done=lambda key, ok, error: print(
+                    f"    Mutations {'completed' if ok else 'FAILED'} for {key}"),
+            )
 
-        # Step 2: Wait for mutations
-        print(f"  Waiting for mutations...")
-        wait_for_mutations(ch_host, ch_password, databases)
+            # Step 2: Wait for mutations
+            print(f"  Waiting for mutations...")
+            ok, error = watch.wait()
+            if not ok:
+                raise RuntimeError(error)
 
         # Step 3: Backfill
-        cust["status"] = "backfilling"
-        save_tracking(tracking)
+        update_customer(tracking, customer_id, status="backfilling")
 
-        print(f"  Running backfill...")
-        success, error = run_backfill_single_customer(cluster, customer_id, pf)
+        with limits.workflows:
+            print(f"  Running backfill...")
+            success, error = run_backfill_adaptive(
+                cluster, customer_id, workflows, customer_rows(cust))
 
         if not success:
             raise RuntimeError(f"Backfill failed: {error}")
 
         # Step 4: Count after
         print(f"  Counting post-backfill data...")
-        cust["after_counts"] = count_ch_data(ch_host, ch_password, databases)
+        after = count_ch_data(ch_host, ch_password, databases)
 
         # Done
-        cust["status"] = "completed"
-        cust["completed_at"] = now_iso()
-        save_tracking(tracking)
+        update_customer(tracking, customer_id, status="completed", completed_at=now_iso(),
+                        after_counts=after)
 
         before = cust["before_counts"]
-        after = cust["after_counts"]
         sc_delta = before["scorecard"] - after["scorecard"]
         score_delta = before["score"] - after["score"]
         print(f"  DONE: scorecard {before['scorecard']} -> {after['scorecard']} (-{sc_delta}), "
               f"score {before['score']} -> {after['score']} (-{score_delta})")
 
     except Exception as e:
-        cust["status"] = "failed"
-        cust["error"] = str(e)
-        cust["completed_at"] = now_iso()
-        save_tracking(tracking)
+        update_customer(tracking, customer_id, status="failed", error=str(e), completed_at=now_iso())
         print(f"  FAILED: {e}")
 
 
+def process_customer_swap(
+    tracking: dict,
+    customer_id: str,
+    ch_host: str,
+    ch_password: str,
+    cluster: str,
+    workflows: WorkflowMonitor,
+    limits: StageLimits,
+    mutations: MutationTracker,
+) -> None:
+    """Swap mode: backfill next to the live data, then swap rebuilt partitions in."""
+    cust = tracking["customers"][customer_id]
+    databases = cust["databases"]
+
+    try:
+        cutoff = ch_now(ch_host, ch_password)
+        update_customer(tracking, customer_id, status="backfilling", started_at=now_iso(),
+                        error=None, rebuild_cutoff=cutoff)
+
+        with limits.workflows:
+            print(f"  Running backfill (rows written before {cutoff} are stale)...")
+            success, error = run_backfill_adaptive(
+                cluster, customer_id, workflows, customer_rows(cust))
+        if not success:
+            raise RuntimeError(f"Backfill failed: {error}")
+
+        update_customer(tracking, customer_id, status="swapping")
+        raced = []
+        with limits.mutations:
+            print(f"  Rebuilding partitions in staging tables...")
+            for db in databases:
+                for table in ("scorecard", "score"):
+                    raced += rebuild_table(ch_host, ch_password, db, table, cutoff, mutations, customer_id)
+
+        if raced:
+            # Rows inserted mid-swap were replaced away; reindex puts them back
+            print(f"  Re-running backfill for {len(raced)} partition(s) hit by the swap race...")
+            with limits.workflows:
+                success, error = run_backfill_adaptive(
+                    cluster, customer_id, workflows, customer_rows(cust))
+            if not success:
+                raise RuntimeError(f"Backfill rerun after swap race failed ({', '.join(raced)}): {error}")
+
+        print(f"  Counting post-swap data...")
+        after = count_ch_data(ch_host, ch_password, databases)
+        update_customer(tracking, customer_id, status="completed", completed_at=now_iso(),
+                        after_counts=after)
+
+        before = cust["before_counts"]
+        print(f"  DONE: scorecard {before['scorecard']} -> {after['scorecard']}, "
+              f"score {before['score']} -> {after['score']}")
+
+    except Exception as e:
+        update_customer(tracking, customer_id, status="failed", error=str(e), completed_at=now_iso())
+        print(f"  FAILED: {e}")
+
+
+def run_scheduler(
+    tracking: dict,
+    pending: list[str],
+    ch_host: str,
+    ch_password: str,
+    cluster: str,
+    pf: PortForward,
+    concurrency: int,
+    limits: StageLimits,
+    stop: threading.Event,
+) -> None:
+    """Run pending customers through the pipeline, at most `concurrency` at a time."""
+    mutations = MutationTracker(ch_host, ch_password)
+    workflows = WorkflowMonitor(pf)
+    scope = get_log_prefix()  # "[<cluster>] " in --clusters mode
+
+    def worker(customer_id: str):
+        if stop.is_set():
+            return
+        set_log_prefix(f"{scope}[{customer_id}] ")
+        try:
+            process_customer(tracking, customer_id, ch_host, ch_password, cluster, workflows, limits, mutations)
+        finally:
+            set_log_prefix(scope)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="customer") as pool:
+        futures = {pool.submit(worker, customer_id): customer_id for customer_id in pending}
+        for future in as_completed(futures):
+            future.result()
+            with TRACKING_LOCK:
+                statuses = [v["status"] for v in tracking["customers"].values()]
+            print(f"\n  {futures[future]} finished. "
+                  f"Completed: {statuses.count('completed')}, "
+                  f"Failed: {statuses.count('failed')}, "
+                  f"In progress: {sum(statuses.count(st) for st in ('deleting', 'backfilling', 'swapping'))}, "
+                  f"Pending: {statuses.count('pending')}")
+    mutations.stop()
+    workflows.stop()
+
+
 # ---- Commands ----
 
 def cmd_status(cluster: str):
@@ -642,7 +1843,7 @@ def cmd_status(cluster: str):
     print(f"Customers:  {len(customers)}")
     print("------------------------------------------------------------")
 
-    for status in ["completed", "backfilling", "deleting", "failed", "pending"]:
+    for status in ["completed", "swapping", "backfilling", "deleting", "failed", "pending"]:
         count = counts.get(status, 0)
         if count > 0:
             names = sorted(k for k, v in customers.items() if v["status"] == status)
@@ -701,18 +1902,22 @@ def cmd_reset(cluster: str, customer_id: str):
         print(f"Available: {', '.join(sorted(tracking['customers'].keys()))}")
         return
 
-    cust = tracking["customers"][customer_id]
-    old_status = cust["status"]
-    cust["status"] = "pending"
-    cust["error"] = None
-    cust["started_at"] = None
-    cust["completed_at"] = None
-    cust["after_counts"] = None
-    save_tracking(tracking)
+    old_status = tracking["customers"][customer_id]["status"]
+    update_customer(tracking, customer_id, status="pending", error=None,
+                    started_at=None, completed_at=None, after_counts=None)
+    tracking_journal(cluster).close(tracking)
     print(f"Reset {customer_id}: {old_status} -> pending")
 
 
-def cmd_run(cluster: str, ch_host: str, ch_password: str):
+def prepare_cluster(
+    cluster: str,
+    ch_host: str,
+    ch_password: str,
+    concurrency: int,
+    max_mutations: int,
+    max_workflows: int,
+) -> tuple[dict, list[str]]:
+    """Load or initialize a cluster's tracking and order its pending customers. Returns (tracking, pending)."""
     # Check if we have an existing tracking file
     tracking = load_tracking(cluster)
 
@@ -721,7 +1926,7 @@ def cmd_run(cluster: str, ch_host: str, ch_password: str):
         customers = discover_databases(ch_host, ch_password, cluster)
         if not customers:
             print("No customers with scorecard data found.")
-            return
+            return None, []
 
         # Mark skip customers
         for skip_id in SKIP_CUSTOMERS:
@@ -754,55 +1959,61 @@ def cmd_run(cluster: str, ch_host: str, ch_password: str):
 
     if not pending:
         print("All customers are completed or in progress. Nothing to do.")
-        return
+        return tracking, []
 
-    print(f"{len(pending)} customers to process")
+    print(f"{len(pending)} customers to process "
+          f"(concurrency={concurrency}, max mutations={max_mutations}, max workflows={max_workflows})")
+    pending = plan_order(tracking, pending, concurrency)
     print()
+    return tracking, pending
+
+
+def cmd_run(
+    cluster: str,
+    ch_host: str,
+    ch_password: str,
+    concurrency: int = CONCURRENCY,
+    max_mutations: int = MAX_CONCURRENT_MUTATIONS,
+    max_workflows: int = MAX_CONCURRENT_WORKFLOWS,
+):
+    tracking, pending = prepare_cluster(cluster, ch_host, ch_password,
+                                        concurrency, max_mutations, max_workflows)
+    if not pending:
+        return
 
     # Set up port-forward
-    pf = PortForward(cluster)
+    forwards = PortForwardManager()
+    stop = threading.Event()
 
     def cleanup(sig=None, frame=None):
-        pf.stop()
+        stop.set()
+        forwards.stop_all()
+        ch_pool.close_all()
         if sig:
             print(f"\nInterrupted. Progress saved to {tracking_path(cluster)}")
-            sys.exit(1)
+            sys.stdout.flush()
+            # Worker threads may be sleeping in pollers; don't wait for them,
+            # but don't cut a journal append in half either. Uncompacted updates
+            # are replayed from the journal on the next load.
+            with TRACKING_LOCK:
+                os._exit(1)
+        with TRACKING_LOCK:
+            tracking_journal(cluster).close(tracking)
 
     signal.signal(signal.SIGINT, cleanup)
     signal.signal(signal.SIGTERM, cleanup)
 
-    pf.start()
+    pf = forwards.get(cluster)
 
     try:
-        # Process in batches
-        for batch_start in range(0, len(pending), BATCH_SIZE):
-            batch = pending[batch_start:batch_start + BATCH_SIZE]
-            batch_num = batch_start // BATCH_SIZE + 1
-            total_batches = (len(pending) + BATCH_SIZE - 1) // BATCH_SIZE
-
-            print("============================================================")
-            print(f"Batch {batch_num}/{total_batches}: {', '.join(batch)}")
-            print("============================================================")
-
-            for customer_id in batch:
-                process_customer(
-                    tracking, customer_id,
-                    ch_host, ch_password, cluster, pf,
-                )
-
-            # Refresh pending list in case we want to re-check
-            remaining = sum(
-                1 for v in tracking["customers"].values()
-                if v["status"] in ("pending", "failed")
-            )
-            completed = sum(
-                1 for v in tracking["customers"].values()
-                if v["status"] == "completed"
-            )
-            print(f"\n  Batch {batch_num} done. "
-                  f"Completed: {completed}, Remaining: {remaining}")
-
+        sys.stdout = PrefixedStdout(sys.stdout)
+        run_scheduler(
+            tracking, pending, ch_host, ch_password, cluster, pf,
+            concurrency, StageLimits(max_mutations, max_workflows), stop,
+        )
     finally:
+        if isinstance(sys.stdout, PrefixedStdout):
+            sys.stdout = sys.stdout.stream
         cleanup()
 
     print()
@@ -812,32 +2023,216 @@ def cmd_run(cluster: str, ch_host: str, ch_password: str):
     cmd_status(cluster)
 
 
+# ---- Multi-cluster ----
+
+def cluster_env_key(cluster: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]", "_", cluster).upper()
+
+
+def fetch_ch_password(cluster: str) -> str:
+    """Admin password from the cluster's clickhouse-cluster secret."""
+    rc, stdout, stderr = run([
+        "kubectl", f"--context={cluster}_dev", "-n", "clickhouse",
+        "get", "secrets", "clickhouse-cluster",
+        "--template", "{{.data.admin_password}}",
+    ], timeout=30)
+    if rc != 0 or not stdout.strip():
+        raise RuntimeError(f"Could not read ClickHouse password for {cluster}: {stderr.strip()}")
+    return base64.b64decode(stdout.strip()).decode()
+
+
+def resolve_ch_endpoint(cluster: str) -> tuple[str, str]:
+    """(ch_host, ch_password) for a cluster: env overrides, else host template + k8s secret."""
+    key = cluster_env_key(cluster)
+    host = os.environ.get(f"CH_HOST_{key}") or CH_HOST_TEMPLATE.format(cluster=cluster)
+    password = os.environ.get(f"CH_PASSWORD_{key}") or fetch_ch_password(cluster)
+    return host, password
+
+
+def print_cluster_progress(trackings: dict[str, dict], states: dict[str, str]) -> None:
+    """One line per cluster: customer statuses and pipeline state."""
+    print("------------------------------------------------------------")
+    print(f"  {'CLUSTER':18s} {'DONE':>5s} {'FAIL':>5s} {'ACTIVE':>6s} {'PEND':>5s} {'TOTAL':>5s}  STATE")
+    for cluster in sorted(states):
+        tracking = trackings.get(cluster)
+        if tracking is None:
+            print(f"  {cluster:18s} {'-':>5s} {'-':>5s} {'-':>6s} {'-':>5s} {'-':>5s}  {states[cluster]}")
+            continue
+        with TRACKING_LOCK:
+            statuses = [v["status"] for v in tracking["customers"].values()]
+        active = sum(statuses.count(st) for st in ("deleting", "backfilling", "swapping"))
+        print(f"  {cluster:18s} {statuses.count('completed'):5d} {statuses.count('failed'):5d} "
+              f"{active:6d} {statuses.count('pending'):5d} {len(statuses):5d}  {states[cluster]}")
+    print("------------------------------------------------------------")
+
+
+def cmd_run_clusters(
+    clusters: list[str],
+    concurrency: int = CONCURRENCY,
+    max_mutations: int = MAX_CONCURRENT_MUTATIONS,
+    max_workflows: int = MAX_CONCURRENT_WORKFLOWS,
+):
+    """
+    Run independent per-cluster pipelines concurrently in one process.
+
+    Each cluster gets its own ClickHouse endpoint, Temporal port-forward, tracking
+    file, mutation tracker, workflow monitor and concurrency/stage limits, so total
+    time is roughly that of the slowest cluster. Output lines are prefixed with
+    [<cluster>] / [<cluster>] [<customer>], and a combined progress table is printed
+    every CLUSTER_PROGRESS_INTERVAL seconds and at the end.
+    """
+    endpoints = {}
+    for cluster in clusters:
+        try:
+            endpoints[cluster] = resolve_ch_endpoint(cluster)
+        except RuntimeError as e:
+            print(f"ERROR: {e}")
+            print(f"  Set CH_PASSWORD_{cluster_env_key(cluster)} to provide it explicitly.")
+            sys.exit(1)
+
+    forwards = PortForwardManager()
+    stop = threading.Event()
+    trackings: dict[str, dict] = {}
+    states = {cluster: "starting" for cluster in clusters}
+
+    def cleanup(sig=None, frame=None):
+        stop.set()
+        forwards.stop_all()
+        ch_pool.close_all()
+        if sig:
+            print(f"\nInterrupted. Progress saved to {TRACKING_DIR}")
+            sys.stdout.flush()
+            with TRACKING_LOCK:
+                os._exit(1)
+        with TRACKING_LOCK:
+            for cluster, tracking in trackings.items():
+                tracking_journal(cluster).close(tracking)
+
+    def run_cluster(cluster: str):
+        set_log_prefix(f"[{cluster}] ")
+        ch_host, ch_password = endpoints[cluster]
+        try:
+            states[cluster] = "discovering"
+            tracking, pending = prepare_cluster(cluster, ch_host, ch_password,
+                                                concurrency, max_mutations, max_workflows)
+            if tracking is not None:
+                trackings[cluster] = tracking
+            if not pending:
+                states[cluster] = "nothing to do"
+                return
+            states[cluster] = "running"
+            run_scheduler(
+                tracking, pending, ch_host, ch_password, cluster, forwards.get(cluster),
+                concurrency, StageLimits(max_mutations, max_workflows), stop,
+            )
+            states[cluster] = "finished"
+        except Exception as e:
+            # One cluster's failure (VPN to its ClickHouse, port-forward) shouldn't stop the others
+            states[cluster] = f"ERROR: {e}"
+            print(f"ERROR: {e}")
+
+    signal.signal(signal.SIGINT, cleanup)
+    signal.signal(signal.SIGTERM, cleanup)
+
+    print(f"Running {len(clusters)} clusters concurrently: {', '.join(clusters)}")
+    try:
+        sys.stdout = PrefixedStdout(sys.stdout)
+        with ThreadPoolExecutor(max_workers=len(clusters), thread_name_prefix="cluster") as pool:
+            futures = [pool.submit(run_cluster, cluster) for cluster in clusters]
+            while True:
+                _, not_done = wait(futures, timeout=CLUSTER_PROGRESS_INTERVAL)
+                if not not_done:
+                    break
+                print_cluster_progress(trackings, states)
+    finally:
+        if isinstance(sys.stdout, PrefixedStdout):
+            sys.stdout = sys.stdout.stream
+        cleanup()
+
+    print()
+    print("============================================================")
+    print("Multi-cluster cleanup finished!")
+    print("============================================================")
+    print_cluster_progress(trackings, states)
+
+
 # ---- Main ----
 
 def main():
+    global CH_TRANSPORT, COUNT_MODE, DELETE_STRATEGY, CLEANUP_MODE, PLAN_ORDER
+
     parser = argparse.ArgumentParser(
         description="Appeal scorecard cleanup - per cluster orchestration"
     )
-    parser.add_argument("cluster", help="Cluster name (e.g., voice-prod)")
+    parser.add_argument("cluster", nargs="?", help="Cluster name (e.g., voice-prod)")
     parser.add_argument("ch_host", nargs="?",
                         help="ClickHouse host")
     parser.add_argument("ch_password", nargs="?",
                         help="ClickHouse admin password")
+    parser.add_argument("--clusters", metavar="C1,C2,...",
+                        help="Run several clusters concurrently (hosts/passwords from "
+                             "CH_HOST_<CLUSTER>/CH_PASSWORD_<CLUSTER> or the k8s secret)")
     parser.add_argument("--status", action="store_true",
                         help="Show progress for this cluster")
     parser.add_argument("--reset", metavar="CUSTOMER",
                         help="Reset a customer to pending")
+    parser.add_argument("--ch-transport", choices=["native", "subprocess"], default=CH_TRANSPORT,
+                        help=f"ClickHouse access: pooled native connections or one client "
+                             f"process per query (default: {CH_TRANSPORT})")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY,
+                        help=f"Customers processed at once (default: {CONCURRENCY})")
+    parser.add_argument("--max-mutations", type=int, default=MAX_CONCURRENT_MUTATIONS,
+                        help=f"Customers in the delete/mutation stage at once "
+                             f"(default: {MAX_CONCURRENT_MUTATIONS})")
+    parser.add_argument("--max-workflows", type=int, default=MAX_CONCURRENT_WORKFLOWS,
+                        help=f"Customers running reindex workflows at once "
+                             f"(default: {MAX_CONCURRENT_WORKFLOWS})")
+    parser.add_argument("--mode", choices=["delete", "swap"], default=CLEANUP_MODE,
+                        help=f"delete = delete live data then backfill; swap = backfill, then rebuild "
+                             f"partitions in staging tables and REPLACE PARTITION (default: {CLEANUP_MODE})")
+    parser.add_argument("--delete-strategy", choices=["auto", "mutation"], default=DELETE_STRATEGY,
+                        help=f"auto = DROP PARTITION / lightweight DELETE / mutation per partition; "
+                             f"mutation = ALTER ... DELETE per table (default: {DELETE_STRATEGY})")
+    parser.add_argument("--count-mode", choices=["parts", "scan"], default=COUNT_MODE,
+                        help=f"Before/after row counts from system.parts metadata or full "
+                             f"count() scans (default: {COUNT_MODE})")
+    parser.add_argument("--order", choices=["lpt", "name"], default=PLAN_ORDER,
+                        help=f"Customer start order: longest estimated duration first, or "
+                             f"alphabetical (default: {PLAN_ORDER})")
 
     args = parser.parse_args()
 
-    if args.status:
+    CH_TRANSPORT = args.ch_transport
+    COUNT_MODE = args.count_mode
+    DELETE_STRATEGY = args.delete_strategy
+    CLEANUP_MODE = args.mode
+    PLAN_ORDER = args.order
+    if CH_TRANSPORT == "native" and not ch_pool.native_available():
+        print("clickhouse-driver not installed; using clickhouse client subprocess")
+
+    clusters = [c.strip() for c in args.clusters.split(",") if c.strip()] if args.clusters else []
+    if clusters and args.cluster:
+        parser.error("give either <cluster> or --clusters, not both")
+    if not clusters and not args.cluster:
+        parser.error("cluster (or --clusters) is required")
+
+    if clusters:
+        if args.reset:
+            parser.error("--reset applies to a single cluster")
+        if args.status:
+            for cluster in clusters:
+                cmd_status(cluster)
+        else:
+            cmd_run_clusters(clusters, args.concurrency, args.max_mutations, args.max_workflows)
+    elif args.status:
         cmd_status(args.cluster)
     elif args.reset:
         cmd_reset(args.cluster, args.reset)
     else:
         if not args.ch_host or not args.ch_password:
             parser.error("ch_host and ch_password are required for running cleanup")
-        cmd_run(args.cluster, args.ch_host, args.ch_password)
+        cmd_run(args.cluster, args.ch_host, args.ch_password,
+                args.concurrency, args.max_mutations, args.max_workflows)
 
 
 if __name__ == "__main__":
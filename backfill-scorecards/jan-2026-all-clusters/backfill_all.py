@@ -3,10 +3,22 @@
 Backfill scorecards for all customers across all clusters.
 
 This script:
-1. Creates k8s jobs from the cron-batch-reindex-conversations cronjob
-2. Waits for job logs and parses temporal workflow info
+1. Creates k8s jobs from the cron-batch-reindex-conversations cronjob (rendered
+   in-process, one kubectl apply per cluster; see ../k8s_jobs.py)
+2. Follows each job's pod log and stops at the temporal workflow line
 3. Outputs tracking data to a JSON file for later status queries
 
+Every JobInfo change is appended to <output>.journal.jsonl as it happens and
+folded into the output JSON (same layout as before) when the run ends or is
+interrupted. --resume continues from there: jobs that were already created are
+not created again, and only jobs still missing a workflow ID are followed.
+Without --resume the existing output JSON is only replaced once the new run has
+results to write.
+
+With --parallel N, jobs are created on all clusters at once and the logs of up
+to N jobs are collected concurrently (output lines are prefixed with
+[cluster/customer]).
+
 Created: 2026-02-07
 Updated: 2026-02-07
 
@@ -14,6 +26,8 @@ Usage:
     python3 backfill_all.py --config config.json
     python3 backfill_all.py --config config.json --dry-run
     python3 backfill_all.py --config config.json --cluster us-east-1-prod --customer sunbit
+    python3 backfill_all.py --config config.json --parallel 32
+    python3 backfill_all.py --config config.json --parallel 32 --resume
 """
 
 import argparse
@@ -22,24 +36,44 @@ import os
 import re
 import subprocess
 import sys
+import threading
 import time
-from dataclasses import dataclass, asdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, asdict, fields
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from prefixed_stdout import PrefixedStdout, set_log_prefix
+from k8s_jobs import JobRenderer, apply_jobs
+
 
 # Configuration
 NAMESPACE = "cresta-cron"
 CRONJOB_NAME = "cron-batch-reindex-conversations"
+LOG_MARKER = "Created reindex conversations job"
 LOG_PATTERN = re.compile(
-    r'Created reindex conversations job: name=([^,]+), execution_id=([^,]+), cluster=(\S+)'
+    LOG_MARKER + r': name=([^,]+), execution_id=([^,]+), cluster=(\S+)'
 )
 
 # Default time range for backfill
 DEFAULT_START_TIME = "2026-01-01T00:00:00Z"
 DEFAULT_END_TIME = "2026-02-01T00:00:00Z"
 
+# Jobs whose logs are collected at once (--parallel); 1 = one job at a time
+DEFAULT_PARALLEL = 1
+
+# k8s puts the job name in the pod's job-name label, so it must fit a label value
+MAX_JOB_NAME_LEN = 63
+JOB_NAME_PREFIX = "batch-reindex-conversations"
+
+# Set on Ctrl-C in --parallel mode so log followers still running give up
+STOPPING = threading.Event()
+# `kubectl logs -f` processes being read by follow_job_logs, killed by stop_followers()
+_followers: set[subprocess.Popen] = set()
+_followers_lock = threading.Lock()
+
 
 @dataclass
 class JobInfo:
@@ -56,6 +90,107 @@ class JobInfo:
     error: Optional[str] = None
 
 
+def job_from_dict(data: dict) -> JobInfo:
+    names = {f.name for f in fields(JobInfo)}
+    return JobInfo(**{k: v for k, v in data.items() if k in names})
+
+
+def job_key(cluster: str, customer: str, profile: str) -> tuple[str, str, str]:
+    return cluster, customer, profile
+
+
+def reusable_job(previous: Optional[JobInfo]) -> bool:
+    """True if an earlier run already created this job (whether or not its workflow ID is known)."""
+    return bool(previous and previous.k8s_job_name and previous.status in ("created", "running"))
+
+
+class ResultsJournal:
+    """
+    The output JSON as a snapshot plus `<stem>.journal.jsonl`, one full JobInfo
+    record per line, appended (and fsync'd) whenever a job changes.
+
+    Loading replays the journal over the snapshot, the last record per
+    (cluster, customer, profile) wins; a torn last line from a crash is dropped.
+    compact() writes the merged jobs in the save_results() layout and clears
+    the journal.
+
+    A fresh run (fresh=True) leaves the existing output JSON alone until it has
+    something to replace it with: its journal starts with a FRESH_RUN marker,
+    and a journal with that marker is loaded without the old snapshot, so the
+    first compaction writes only this run's jobs.
+    """
+
+    FRESH_RUN = {"fresh_run": True}
+
+    def __init__(self, output_path: str, fresh: bool = False):
+        self.path = Path(output_path)
+        self.journal_path = self.path.with_name(f"{self.path.stem}.journal.jsonl")
+        self.fresh = fresh
+        self._lock = threading.Lock()
+        self._fh = None
+
+    def load(self) -> dict[tuple[str, str, str], JobInfo]:
+        records = []
+        if self.journal_path.exists():
+            with open(self.journal_path) as f:
+                for lineno, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        print(f"WARNING: {self.journal_path}:{lineno}: unreadable record, ignoring the rest")
+                        break
+
+        jobs = {}
+        replaces_snapshot = bool(records) and records[0] == self.FRESH_RUN
+        if self.path.exists() and not replaces_snapshot:
+            with open(self.path) as f:
+                for data in json.load(f).get("jobs", []):
+                    job = job_from_dict(data)
+                    jobs[job_key(job.cluster, job.customer, job.profile)] = job
+        for data in records[1:] if replaces_snapshot else records:
+            job = job_from_dict(data)
+            jobs[job_key(job.cluster, job.customer, job.profile)] = job
+        return jobs
+
+    def record(self, job_info: JobInfo):
+        with self._lock:
+            if self._fh is None:
+                self._fh = open(self.journal_path, "a")
+                if self.fresh:
+                    self._fh.write(json.dumps(self.FRESH_RUN) + "\n")
+                    self.fresh = False
+            self._fh.write(json.dumps(asdict(job_info)) + "\n")
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def _clear_journal(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+
+    def compact(self) -> bool:
+        """Fold the journal into the output JSON; False if there was nothing to fold."""
+        with self._lock:
+            if self._fh is None and not self.journal_path.exists():
+                return False
+            save_results(list(self.load().values()), str(self.path), quiet=True)
+            self._clear_journal()
+            return True
+
+
+# Set by main() unless --dry-run; process_customer records every JobInfo change here
+JOURNAL: Optional[ResultsJournal] = None
+
+
+def record_job(job_info: JobInfo):
+    if JOURNAL is not None:
+        JOURNAL.record(job_info)
+
+
 def run_cmd(cmd: list[str], timeout: int = 60) -> tuple[int, str, str]:
     """Run a shell command and return (returncode, stdout, stderr)."""
     try:
@@ -72,138 +207,192 @@ def run_cmd(cmd: list[str], timeout: int = 60) -> tuple[int, str, str]:
         return -1, "", str(e)
 
 
-def create_job(
+def job_env(customer: str, start_time: str, end_time: str) -> dict[str, str]:
+    """Env vars that scope the reindex job to one customer and time range."""
+    return {
+        "REINDEX_START_TIME": start_time,
+        "REINDEX_END_TIME": end_time,
+        "RUN_ONLY_FOR_CUSTOMER_IDS": customer,
+    }
+
+
+def job_names_for(targets: list[tuple[str, str]], timestamp: int) -> list[str]:
+    """
+    k8s job names for (customer, profile) pairs created in the same second.
+
+    Names carry the customer and profile, lowercased to [a-z0-9-] and cut to
+    MAX_JOB_NAME_LEN; pairs that still collide after truncation get an index.
+    """
+    def job_name(customer: str, profile: str, suffix: str) -> str:
+        slug = re.sub(r"[^a-z0-9-]+", "-", f"{customer}-{profile}".lower()).strip("-")
+        head = f"{JOB_NAME_PREFIX}-{slug}"[:MAX_JOB_NAME_LEN - len(suffix)].rstrip("-")
+        return head + suffix
+
+    names = [job_name(customer, profile, f"-{timestamp}") for customer, profile in targets]
+    if len(set(names)) < len(names):
+        names = [
+            job_name(customer, profile, f"-{i}-{timestamp}")
+            for i, (customer, profile) in enumerate(targets)
+        ]
+    assert len(set(names)) == len(names), f"duplicate job names: {names}"
+    return names
+
+
+def create_jobs(
     cluster: str,
-    customer: str,
+    targets: list[tuple[str, str]],
     start_time: str,
     end_time: str,
     dry_run: bool = False
-) -> tuple[bool, str, str]:
+) -> list[tuple[bool, str, str]]:
     """
-    Create a k8s job for a customer.
+    Create one k8s job per (customer, profile) with a single kubectl apply.
 
-    Returns: (success, job_name, error_message)
+    Returns: [(success, job_name, error_message)] in the order of `targets`
     """
     context = f"{cluster}_dev"
-    timestamp = int(time.time())
-    job_name = f"batch-reindex-conversations-{customer}-{timestamp}"
-
-    # Step 1: Create job YAML from cronjob template
-    create_cmd = [
-        "kubectl", "create", "job",
-        "--from", f"cronjob/{CRONJOB_NAME}",
-        job_name,
-        "-n", NAMESPACE,
-        f"--context={context}",
-        "--dry-run=client", "-o", "yaml"
-    ]
-
-    rc, stdout, stderr = run_cmd(create_cmd)
-    if rc != 0:
-        return False, job_name, f"Failed to create job template: {stderr}"
-
-    # Write base job yaml to temp file
-    tmp_base = Path("/tmp/reindex-job-base.yaml")
-    tmp_base.write_text(stdout)
-
-    # Step 2: Set environment variables
-    env_cmd = [
-        "kubectl", "set", "env",
-        "--local", "-f", str(tmp_base),
-        f"REINDEX_START_TIME={start_time}",
-        f"REINDEX_END_TIME={end_time}",
-        f"RUN_ONLY_FOR_CUSTOMER_IDS={customer}",
-        "-o", "yaml"
-    ]
-
-    rc, stdout, stderr = run_cmd(env_cmd)
-    if rc != 0:
-        return False, job_name, f"Failed to set env vars: {stderr}"
-
-    tmp_final = Path("/tmp/reindex-job-final.yaml")
-    tmp_final.write_text(stdout)
+    job_names = job_names_for(targets, int(time.time()))
+
+    # Render from the cronjob template (fetched once per cluster)
+    renderer = JobRenderer(context, NAMESPACE, CRONJOB_NAME)
+    try:
+        manifests = [
+            renderer.render(job_name, job_env(customer, start_time, end_time))
+            for (customer, _), job_name in zip(targets, job_names)
+        ]
+    except RuntimeError as e:
+        return [(False, job_name, f"Failed to create job template: {e}") for job_name in job_names]
 
     if dry_run:
-        print(f"  [DRY-RUN] Would create job: {job_name}")
-        return True, job_name, ""
+        for job_name in job_names:
+            print(f"  [DRY-RUN] Would create job: {job_name}")
+        return [(True, job_name, "") for job_name in job_names]
+
+    applied, stderr = apply_jobs(context, NAMESPACE, manifests)
+    created_at = datetime.utcnow().isoformat() + "Z"
+
+    results = []
+    for (customer, profile), job_name in zip(targets, job_names):
+        if job_name in applied:
+            print(f"  Created k8s job: {job_name}")
+            # Journal the live job now, so an interrupt before its log is followed
+            # doesn't make --resume create it again
+            record_job(JobInfo(
+                customer=customer,
+                profile=profile,
+                cluster=cluster,
+                k8s_job_name=job_name,
+                status="created",
+                created_at=created_at
+            ))
+            results.append((True, job_name, ""))
+        else:
+            results.append((False, job_name, f"Failed to apply job: {stderr or 'not applied'}"))
+    return results
 
-    # Step 3: Apply the job
-    apply_cmd = [
-        "kubectl", "apply",
-        "-f", str(tmp_final),
-        f"--context={context}"
-    ]
 
-    rc, stdout, stderr = run_cmd(apply_cmd)
-    if rc != 0:
-        return False, job_name, f"Failed to apply job: {stderr}"
+def create_job(
+    cluster: str,
+    customer: str,
+    profile: str,
+    start_time: str,
+    end_time: str,
+    dry_run: bool = False
+) -> tuple[bool, str, str]:
+    """
+    Create a k8s job for a customer.
 
-    print(f"  Created k8s job: {job_name}")
-    return True, job_name, ""
+    Returns: (success, job_name, error_message)
+    """
+    return create_jobs(cluster, [(customer, profile)], start_time, end_time, dry_run)[0]
 
 
-def wait_for_job_logs(
+def follow_job_logs(
     cluster: str,
     job_name: str,
     max_wait: int = 300,
     poll_interval: int = 10
-) -> tuple[bool, str]:
+) -> tuple[bool, Optional[tuple[str, str, str]], str]:
     """
-    Wait for a job's pod to start and return its logs.
+    Wait for a job's pod to start, then stream its log (`kubectl logs -f`) and
+    stop at the first line matching LOG_PATTERN.
 
-    Returns: (success, logs_or_error)
+    Returns: (success, (job_name, execution_id, cluster) or None if the log
+    ended without it, error)
     """
     context = f"{cluster}_dev"
+    deadline = time.time() + max_wait
     start_time = time.time()
 
-    while time.time() - start_time < max_wait:
-        # Get pods for this job
-        get_pods_cmd = [
+    while time.time() < deadline and not STOPPING.is_set():
+        # Get the job's pod and its phase in one call
+        rc, stdout, stderr = run_cmd([
             "kubectl", "get", "pods",
             "-n", NAMESPACE,
             f"--context={context}",
             "-l", f"job-name={job_name}",
-            "-o", "jsonpath={.items[0].metadata.name}"
-        ]
-
-        rc, pod_name, stderr = run_cmd(get_pods_cmd)
-        if rc != 0 or not pod_name.strip():
+            "-o", "jsonpath={.items[0].metadata.name} {.items[0].status.phase}"
+        ])
+        pod_name, _, phase = stdout.strip().partition(" ")
+        if rc != 0 or not pod_name:
             print(f"  Waiting for pod to be created... ({int(time.time() - start_time)}s)")
-            time.sleep(poll_interval)
+            STOPPING.wait(poll_interval)
             continue
 
-        pod_name = pod_name.strip()
-
-        # Check if pod is running or completed
-        get_status_cmd = [
-            "kubectl", "get", "pod", pod_name,
-            "-n", NAMESPACE,
-            f"--context={context}",
-            "-o", "jsonpath={.status.phase}"
-        ]
-
-        rc, phase, stderr = run_cmd(get_status_cmd)
-        phase = phase.strip()
-
-        if phase in ["Running", "Succeeded", "Failed"]:
-            # Try to get logs
-            logs_cmd = [
-                "kubectl", "logs", pod_name,
-                "-n", NAMESPACE,
-                f"--context={context}"
-            ]
-
-            rc, logs, stderr = run_cmd(logs_cmd, timeout=120)
-            if rc == 0 and logs:
-                return True, logs
-
-            if phase == "Failed":
-                return False, f"Pod failed. stderr: {stderr}"
-
-        print(f"  Pod status: {phase}, waiting... ({int(time.time() - start_time)}s)")
-        time.sleep(poll_interval)
+        if phase not in ["Running", "Succeeded", "Failed"]:
+            print(f"  Pod status: {phase}, waiting... ({int(time.time() - start_time)}s)")
+            STOPPING.wait(poll_interval)
+            continue
 
-    return False, f"Timeout waiting for job logs after {max_wait}s"
+        with _followers_lock:
+            if STOPPING.is_set():
+                break
+            proc = subprocess.Popen(
+                ["kubectl", "logs", "-f", pod_name, "-n", NAMESPACE, f"--context={context}"],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            )
+            _followers.add(proc)
+        # Stop following at the deadline even if the pod keeps logging
+        timer = threading.Timer(max(deadline - time.time(), 0), proc.kill)
+        timer.start()
+        try:
+            for line in proc.stdout:
+                # Cheap substring test first; the log is mostly envflag lines
+                if LOG_MARKER not in line:
+                    continue
+                match = LOG_PATTERN.search(line)
+                if match:
+                    return True, match.groups(), ""
+            proc.wait()
+        finally:
+            timer.cancel()
+            with _followers_lock:
+                _followers.discard(proc)
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+        if time.time() >= deadline or STOPPING.is_set():
+            break
+        if proc.returncode == 0:
+            # Container exited and the whole log was read
+            return True, None, ""
+        if phase == "Failed":
+            return False, None, f"Pod failed. stderr: {proc.stderr.read().strip()}"
+        # Stream dropped (e.g. container restarting); look at the pod again
+        STOPPING.wait(poll_interval)
+
+    if STOPPING.is_set():
+        return False, None, "Interrupted while waiting for job logs"
+    return False, None, f"Timeout waiting for job logs after {max_wait}s"
+
+
+def stop_followers():
+    """Make every follow_job_logs call return: set STOPPING and kill the log streams being read."""
+    with _followers_lock:
+        STOPPING.set()
+        for proc in _followers:
+            proc.kill()
 
 
 def parse_job_logs(logs: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
@@ -213,6 +402,8 @@ def parse_job_logs(logs: str) -> tuple[Optional[str], Optional[str], Optional[st
     Returns: (job_name, execution_id, cluster) or (None, None, None)
     """
     for line in logs.split('\n'):
+        if LOG_MARKER not in line:
+            continue
         match = LOG_PATTERN.search(line)
         if match:
             return match.group(1), match.group(2), match.group(3)
@@ -226,29 +417,47 @@ def process_customer(
     start_time: str,
     end_time: str,
     dry_run: bool = False,
-    skip_logs: bool = False
+    skip_logs: bool = False,
+    created: Optional[tuple[bool, str, str]] = None,
+    previous: Optional[JobInfo] = None
 ) -> JobInfo:
-    """Process a single customer - create job and collect info."""
+    """
+    Process a single customer - create job and collect info.
+
+    `created` is the customer's create_jobs() result when its job was already
+    submitted as part of a batch (or reused from `previous`, this customer's
+    record from an earlier run).
+    """
+    if previous is not None and previous.status == "running" and previous.temporal_workflow_id:
+        print(f"\nSkipping {customer}/{profile} on {cluster}: "
+              f"already running as {previous.temporal_workflow_id}")
+        return previous
+
+    reused = reusable_job(previous)
     job_info = JobInfo(
         customer=customer,
         profile=profile,
         cluster=cluster,
         k8s_job_name="",
-        created_at=datetime.utcnow().isoformat() + "Z"
+        created_at=previous.created_at if reused else datetime.utcnow().isoformat() + "Z"
     )
 
     print(f"\nProcessing {customer}/{profile} on {cluster}...")
 
     # Create the job
-    success, job_name, error = create_job(
-        cluster, customer, start_time, end_time, dry_run
-    )
+    if created is None:
+        if reused:
+            created = (True, previous.k8s_job_name, "")
+        else:
+            created = create_job(cluster, customer, profile, start_time, end_time, dry_run)
+    success, job_name, error = created
     job_info.k8s_job_name = job_name
 
     if not success:
         job_info.status = "failed"
         job_info.error = error
         print(f"  ERROR: {error}")
+        record_job(job_info)
         return job_info
 
     if dry_run:
@@ -256,22 +465,25 @@ def process_customer(
         return job_info
 
     job_info.status = "created"
+    if reused:
+        print(f"  Reusing k8s job from the previous run: {job_name}")
+    record_job(job_info)
 
     if skip_logs:
         print("  Skipping log collection (--skip-logs)")
         return job_info
 
-    # Wait for and parse logs
+    # Follow the log until the temporal workflow line shows up
     print("  Waiting for job logs...")
-    success, logs_or_error = wait_for_job_logs(cluster, job_name)
+    success, workflow_info, error = follow_job_logs(cluster, job_name)
 
     if not success:
-        job_info.error = logs_or_error
-        print(f"  WARNING: Could not get logs: {logs_or_error}")
+        job_info.error = error
+        print(f"  WARNING: Could not get logs: {error}")
+        record_job(job_info)
         return job_info
 
-    # Parse temporal info from logs
-    job_resource_name, execution_id, temporal_cluster = parse_job_logs(logs_or_error)
+    job_resource_name, execution_id, temporal_cluster = workflow_info or (None, None, None)
 
     if execution_id:
         job_info.job_resource_name = job_resource_name
@@ -283,27 +495,138 @@ def process_customer(
         job_info.error = "Could not parse temporal workflow ID from logs"
         print(f"  WARNING: {job_info.error}")
 
+    record_job(job_info)
     return job_info
 
 
+def create_cluster_jobs(
+    cluster: str,
+    customer_configs: list[dict],
+    previous: dict[tuple[str, str, str], JobInfo],
+    start_time: str,
+    end_time: str,
+    dry_run: bool = False
+) -> list[tuple[bool, str, str]]:
+    """
+    create_jobs() for the customers without a job from an earlier run; the
+    others get their existing job back. Results are in `customer_configs` order.
+    """
+    created: list[Optional[tuple[bool, str, str]]] = []
+    to_create = []
+    for i, c in enumerate(customer_configs):
+        prev = previous.get(job_key(cluster, c["id"], c.get("profile", "default")))
+        if reusable_job(prev):
+            created.append((True, prev.k8s_job_name, ""))
+        else:
+            created.append(None)
+            to_create.append(i)
+
+    if len(to_create) < len(customer_configs):
+        print(f"Reusing {len(customer_configs) - len(to_create)} job(s) from the previous run")
+    if to_create:
+        print(f"Creating {len(to_create)} job(s)...")
+        new_jobs = create_jobs(
+            cluster,
+            [(customer_configs[i]["id"], customer_configs[i].get("profile", "default")) for i in to_create],
+            start_time, end_time, dry_run
+        )
+        for i, job_created in zip(to_create, new_jobs):
+            created[i] = job_created
+    return created
+
+
+def process_all_parallel(
+    targets: list[tuple[str, list[dict]]],
+    start_time: str,
+    end_time: str,
+    parallel: int,
+    dry_run: bool = False,
+    skip_logs: bool = False,
+    previous: Optional[dict[tuple[str, str, str], JobInfo]] = None
+) -> list[JobInfo]:
+    """
+    Create every cluster's jobs concurrently, then collect logs for up to
+    `parallel` jobs at a time as soon as their cluster's apply returns.
+
+    `targets` is [(cluster, customer_configs)]; results keep that order.
+    """
+    previous = previous or {}
+
+    def run_customer(cluster: str, customer_config: dict, created: tuple[bool, str, str]) -> JobInfo:
+        set_log_prefix(f"[{cluster}/{customer_config['id']}] ")
+        try:
+            return process_customer(
+                cluster=cluster,
+                customer=customer_config["id"],
+                profile=customer_config.get("profile", "default"),
+                start_time=start_time,
+                end_time=end_time,
+                dry_run=dry_run,
+                skip_logs=skip_logs,
+                created=created,
+                previous=previous.get(job_key(cluster, customer_config["id"],
+                                              customer_config.get("profile", "default")))
+            )
+        finally:
+            set_log_prefix("")
+
+    log_pool = ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="logs")
+    create_pool = ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="create")
+    try:
+        def create_cluster(cluster: str, customer_configs: list[dict]) -> list[Future]:
+            set_log_prefix(f"[{cluster}] ")
+            try:
+                created = create_cluster_jobs(
+                    cluster, customer_configs, previous, start_time, end_time, dry_run
+                )
+            finally:
+                set_log_prefix("")
+            return [
+                log_pool.submit(run_customer, cluster, customer_config, job_created)
+                for customer_config, job_created in zip(customer_configs, created)
+            ]
+
+        cluster_futures = [
+            create_pool.submit(create_cluster, cluster, customer_configs)
+            for cluster, customer_configs in targets
+        ]
+        results = [f.result() for cf in cluster_futures for f in cf.result()]
+    except KeyboardInterrupt:
+        # Don't sit in shutdown(wait=True) behind queued jobs and running log followers
+        stop_followers()
+        create_pool.shutdown(wait=False, cancel_futures=True)
+        log_pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    create_pool.shutdown()
+    log_pool.shutdown()
+    return results
+
+
 def load_config(config_path: str) -> dict:
     """Load configuration from JSON file."""
     with open(config_path) as f:
         return json.load(f)
 
 
-def save_results(results: list[JobInfo], output_path: str):
-    """Save results to JSON file."""
+def save_results(results: list[JobInfo], output_path: str, quiet: bool = False):
+    """Save results to JSON file (written to a temp file and renamed into place)."""
     data = {
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "jobs": [asdict(r) for r in results]
     }
-    with open(output_path, 'w') as f:
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'w') as f:
         json.dump(data, f, indent=2)
-    print(f"\nResults saved to: {output_path}")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, output_path)
+    if not quiet:
+        print(f"\nResults saved to: {output_path}")
 
 
 def main():
+    global JOURNAL
+
     parser = argparse.ArgumentParser(
         description="Backfill scorecards for all customers across clusters"
     )
@@ -337,6 +660,20 @@ def main():
         action="store_true",
         help="Skip waiting for logs (faster, but no temporal workflow IDs)"
     )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=DEFAULT_PARALLEL,
+        metavar="N",
+        help="Create jobs on all clusters at once and collect logs for up to N jobs "
+             f"concurrently (default: {DEFAULT_PARALLEL} = one job at a time)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an earlier run from --output and its journal: reuse created jobs, "
+             "only follow logs for jobs without a workflow ID"
+    )
     parser.add_argument(
         "--cluster",
         help="Only process a specific cluster"
@@ -358,41 +695,86 @@ def main():
     print(f"End time:   {args.end_time}")
     print(f"Dry run:    {args.dry_run}")
     print(f"Skip logs:  {args.skip_logs}")
+    print(f"Parallel:   {args.parallel}")
 
     results: list[JobInfo] = []
-
+    previous: dict[tuple[str, str, str], JobInfo] = {}
+
+    if not args.dry_run:
+        JOURNAL = ResultsJournal(args.output, fresh=not args.resume)
+        if args.resume:
+            # Fold whatever the interrupted run journaled before picking up from it
+            JOURNAL.compact()
+            previous = JOURNAL.load()
+            print(f"Resuming:   {len(previous)} job(s) in {args.output}")
+        elif JOURNAL.journal_path.exists():
+            print(f"ERROR: {JOURNAL.journal_path} holds results from an interrupted run. "
+                  f"Pass --resume to continue it, or delete it to start over.")
+            sys.exit(1)
+
+    # Filter by cluster/customer if specified
+    targets = []
     for cluster_config in config.get("clusters", []):
         cluster = cluster_config["name"]
-
-        # Filter by cluster if specified
         if args.cluster and cluster != args.cluster:
             continue
+        customer_configs = [
+            c for c in cluster_config.get("customers", [])
+            if not args.customer or c["id"] == args.customer
+        ]
+        targets.append((cluster, customer_configs))
 
-        print(f"\n{'=' * 60}")
-        print(f"Cluster: {cluster}")
-        print("=" * 60)
-
-        for customer_config in cluster_config.get("customers", []):
-            customer = customer_config["id"]
-            profile = customer_config.get("profile", "default")
-
-            # Filter by customer if specified
-            if args.customer and customer != args.customer:
+    try:
+        if args.parallel > 1:
+            targets = [(cluster, configs) for cluster, configs in targets if configs]
+            if targets:
+                sys.stdout = PrefixedStdout(sys.stdout)
+                try:
+                    results = process_all_parallel(
+                        targets, args.start_time, args.end_time, args.parallel,
+                        dry_run=args.dry_run, skip_logs=args.skip_logs, previous=previous
+                    )
+                finally:
+                    sys.stdout = sys.stdout.stream
+            targets = []
+
+        for cluster, customer_configs in targets:
+            print(f"\n{'=' * 60}")
+            print(f"Cluster: {cluster}")
+            print("=" * 60)
+
+            if not customer_configs:
                 continue
 
-            job_info = process_customer(
-                cluster=cluster,
-                customer=customer,
-                profile=profile,
-                start_time=args.start_time,
-                end_time=args.end_time,
-                dry_run=args.dry_run,
-                skip_logs=args.skip_logs
+            # Submit all of the cluster's new jobs in one apply, then collect their logs
+            created = create_cluster_jobs(
+                cluster, customer_configs, previous,
+                args.start_time, args.end_time, args.dry_run
             )
-            results.append(job_info)
+
+            for customer_config, job_created in zip(customer_configs, created):
+                profile = customer_config.get("profile", "default")
+                job_info = process_customer(
+                    cluster=cluster,
+                    customer=customer_config["id"],
+                    profile=profile,
+                    start_time=args.start_time,
+                    end_time=args.end_time,
+                    dry_run=args.dry_run,
+                    skip_logs=args.skip_logs,
+                    created=job_created,
+                    previous=previous.get(job_key(cluster, customer_config["id"], profile))
+                )
+                results.append(job_info)
+    except KeyboardInterrupt:
+        if JOURNAL is not None and JOURNAL.compact():
+            print(f"\nInterrupted. Progress saved to {args.output}; continue with --resume")
+        sys.exit(1)
 
     # Save results
-    if results:
+    if JOURNAL is not None and JOURNAL.compact():
+        print(f"\nResults saved to: {args.output}")
+    elif results and JOURNAL is None:
         save_results(results, args.output)
     else:
         print("\nNo jobs processed.")
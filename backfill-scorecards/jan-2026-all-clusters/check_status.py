@@ -2,8 +2,21 @@
 """
 Check status of backfill jobs using Temporal CLI.
 
-This script reads the tracking file generated by backfill_all.py and queries
-Temporal for the status of each workflow.
+This script reads the tracking file generated by backfill_all.py (snapshot plus
+its .journal.jsonl, so jobs of a run still in progress are included) and queries
+Temporal for the status of each workflow: batched `temporal workflow list`
+queries (WorkflowId IN (...)), with concurrent `describe` calls for anything the
+list doesn't return. Terminal statuses are cached in <tracking>.status_cache.json
+and not queried again on later runs (--refresh re-queries everything). The
+tracking file itself belongs to backfill_all.py and is never rewritten; --output
+writes a copy with the statuses filled in.
+
+--watch keeps running: every --interval seconds it re-queries only the
+workflows that haven't finished, prints one line per status change plus the
+per-cluster progress rows (completion rate and ETA from the observed
+start/close times) of the clusters that changed, and stops once everything is
+terminal. The full per-cluster table is printed at the start and every
+--table-every refreshes.
 
 Created: 2026-02-07
 Updated: 2026-02-07
@@ -16,17 +29,40 @@ Prerequisites:
 Usage:
     python3 check_status.py --tracking backfill_tracking.json
     python3 check_status.py --tracking backfill_tracking.json --cluster us-east-1-prod
+    python3 check_status.py --tracking backfill_tracking.json --refresh
+    python3 check_status.py --tracking backfill_tracking.json --watch --interval 60
+    python3 check_status.py --tracking backfill_tracking.json --watch --table-every 30
 """
 
 import argparse
 import json
+import os
+import re
 import subprocess
 import sys
-from dataclasses import dataclass
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from backfill_all import ResultsJournal
+
+
+# Statuses that can't change any more; cached in the status cache sidecar
+TERMINAL_STATUSES = {
+    "WORKFLOW_EXECUTION_STATUS_COMPLETED",
+    "WORKFLOW_EXECUTION_STATUS_FAILED",
+    "WORKFLOW_EXECUTION_STATUS_CANCELED",
+    "WORKFLOW_EXECUTION_STATUS_TERMINATED",
+    "WORKFLOW_EXECUTION_STATUS_TIMED_OUT",
+}
+LIST_BATCH_SIZE = 100  # workflow IDs per `temporal workflow list` query
+DEFAULT_WORKERS = 16   # concurrent describe calls
+DEFAULT_WATCH_INTERVAL = 60  # seconds between --watch refreshes
+DEFAULT_TABLE_EVERY = 10     # --watch refreshes between full per-cluster tables
+
 
 @dataclass
 class WorkflowStatus:
@@ -98,6 +134,107 @@ def get_workflow_status(
         )
 
 
+def list_workflow_statuses(
+    workflow_ids: list[str],
+    temporal_address: str = "localhost:7233",
+    namespace: str = "ingestion"
+) -> dict[str, WorkflowStatus]:
+    """
+    Query statuses in batches of LIST_BATCH_SIZE with `WorkflowId IN (...)`.
+
+    IDs the list doesn't return (visibility lag, failed batch) are left out;
+    callers fall back to describe for those.
+    """
+    statuses: dict[str, WorkflowStatus] = {}
+    for i in range(0, len(workflow_ids), LIST_BATCH_SIZE):
+        batch = workflow_ids[i:i + LIST_BATCH_SIZE]
+        query = "WorkflowId IN (" + ", ".join(f'"{w}"' for w in batch) + ")"
+        rc, stdout, stderr = run_cmd([
+            "temporal", "workflow", "list",
+            "--address", temporal_address,
+            "--namespace", namespace,
+            "--query", query,
+            "--output", "json"
+        ], timeout=60)
+        if rc != 0:
+            print(f"  List query failed ({stderr.strip()[:200]}), falling back to describe")
+            continue
+        try:
+            executions = json.loads(stdout) if stdout else []
+        except json.JSONDecodeError:
+            continue
+
+        for wf in executions:
+            workflow_id = wf.get("execution", {}).get("workflowId", "")
+            start_time = wf.get("startTime")
+            # Several runs of one ID can match; keep the latest, like describe does
+            current = statuses.get(workflow_id)
+            if not workflow_id or (current and (current.start_time or "") > (start_time or "")):
+                continue
+            statuses[workflow_id] = WorkflowStatus(
+                workflow_id=workflow_id,
+                status=wf.get("status", "UNKNOWN"),
+                start_time=start_time,
+                close_time=wf.get("closeTime")
+            )
+    return statuses
+
+
+def query_workflow_statuses(
+    workflow_ids: list[str],
+    temporal_address: str = "localhost:7233",
+    namespace: str = "ingestion",
+    workers: int = DEFAULT_WORKERS
+) -> dict[str, WorkflowStatus]:
+    """Batched list queries, then concurrent describes for whatever they missed."""
+    statuses = list_workflow_statuses(workflow_ids, temporal_address, namespace)
+    missing = [w for w in workflow_ids if w not in statuses]
+    if missing:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            described = pool.map(
+                lambda w: get_workflow_status(w, temporal_address, namespace), missing
+            )
+            statuses.update((s.workflow_id, s) for s in described)
+    return statuses
+
+
+def status_cache_path(tracking_path: str) -> Path:
+    path = Path(tracking_path)
+    return path.with_name(f"{path.stem}.status_cache.json")
+
+
+def load_status_cache(tracking_path: str) -> dict[str, WorkflowStatus]:
+    """Terminal statuses from earlier checks, by workflow ID."""
+    path = status_cache_path(tracking_path)
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        workflows = json.load(f).get("workflows", {})
+    return {
+        workflow_id: WorkflowStatus(
+            workflow_id=workflow_id,
+            status=data["status"],
+            start_time=data.get("start_time"),
+            close_time=data.get("close_time")
+        )
+        for workflow_id, data in workflows.items()
+        if data.get("status") in TERMINAL_STATUSES
+    }
+
+
+def save_status_cache(tracking_path: str, cache: dict[str, WorkflowStatus]):
+    """Write the terminal statuses (temp file + fsync + rename)."""
+    data = {
+        "checked_at": datetime.utcnow().isoformat() + "Z",
+        "workflows": {
+            s.workflow_id: {"status": s.status, "start_time": s.start_time, "close_time": s.close_time}
+            for s in cache.values()
+            if s.status in TERMINAL_STATUSES and not s.error
+        }
+    }
+    write_json(str(status_cache_path(tracking_path)), data)
+
+
 def list_workflows_by_prefix(
     prefix: str,
     temporal_address: str = "localhost:7233",
@@ -126,9 +263,180 @@ def list_workflows_by_prefix(
 
 
 def load_tracking(tracking_path: str) -> dict:
-    """Load tracking file."""
+    """Load tracking file, with backfill_all's unfolded journal records applied."""
     with open(tracking_path) as f:
-        return json.load(f)
+        tracking = json.load(f)
+    journal = ResultsJournal(tracking_path)
+    if journal.journal_path.exists():
+        tracking["jobs"] = [asdict(job) for job in journal.load().values()]
+    return tracking
+
+
+def write_json(path: str, data: dict):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def save_tracking(tracking: dict, jobs: list[dict], statuses: dict[str, WorkflowStatus], path: str):
+    """Write a copy of the tracking data with each job's temporal status (--output)."""
+    output_jobs = []
+    for job in jobs:
+        job = dict(job)
+        workflow_id = job.get("temporal_workflow_id")
+        if workflow_id and workflow_id in statuses and not statuses[workflow_id].error:
+            job["temporal_status"] = statuses[workflow_id].status
+            job["temporal_start_time"] = statuses[workflow_id].start_time
+            job["temporal_close_time"] = statuses[workflow_id].close_time
+        output_jobs.append(job)
+
+    write_json(path, {
+        "generated_at": tracking.get("generated_at"),
+        "status_checked_at": datetime.utcnow().isoformat() + "Z",
+        "jobs": output_jobs
+    })
+
+
+def parse_time(value: Optional[str]) -> Optional[datetime]:
+    """Parse Temporal's RFC 3339 timestamps (nanosecond fractions are cut to micro)."""
+    if not value:
+        return None
+    value = re.sub(r"(\.\d{6})\d+", r"\1", value).replace("Z", "+00:00")
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def short_status(status: str) -> str:
+    return status.replace("WORKFLOW_EXECUTION_STATUS_", "")
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 3600:
+        return f"{seconds // 60}m"
+    if seconds < 86400:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    return f"{seconds // 86400}d{seconds % 86400 // 3600:02d}h"
+
+
+def estimate_progress(workflow_statuses: list[WorkflowStatus]) -> tuple[Optional[float], Optional[float]]:
+    """
+    (completions per hour, seconds to go) from the observed throughput: terminal
+    workflows per unit time since the earliest start. None when there's nothing
+    to go on (nothing finished yet) or nothing left.
+    """
+    finished = [s for s in workflow_statuses if s.status in TERMINAL_STATUSES]
+    remaining = len(workflow_statuses) - len(finished)
+    starts = [t for t in (parse_time(s.start_time) for s in workflow_statuses) if t]
+    if not finished or not starts:
+        return None, None
+    if remaining:
+        window_end = datetime.now(timezone.utc)
+    else:
+        closes = [t for t in (parse_time(s.close_time) for s in finished) if t]
+        window_end = max(closes) if closes else datetime.now(timezone.utc)
+    elapsed = (window_end - min(starts)).total_seconds()
+    if elapsed <= 0:
+        return None, None
+    per_second = len(finished) / elapsed
+    return per_second * 3600, (remaining / per_second if remaining else None)
+
+
+def print_cluster_progress(
+    jobs: list[dict],
+    statuses: dict[str, WorkflowStatus],
+    only: Optional[set[str]] = None
+):
+    """Per-cluster completion, failures, throughput and ETA (rows for `only` plus TOTAL, if given)."""
+    by_cluster: dict[str, list[WorkflowStatus]] = {}
+    no_id: dict[str, int] = {}
+    for job in jobs:
+        cluster = job.get("cluster", "")
+        workflow_id = job.get("temporal_workflow_id")
+        if workflow_id and workflow_id in statuses:
+            by_cluster.setdefault(cluster, []).append(statuses[workflow_id])
+        else:
+            no_id[cluster] = no_id.get(cluster, 0) + 1
+
+    print(f"\n{'Cluster':<22} {'Done':>9} {'%':>5} {'Failed':>7} {'Running':>8} {'No ID':>6} "
+          f"{'Rate/h':>7} {'ETA':>7}")
+    print("-" * 78)
+    rows = [(c, sts) for c, sts in sorted(by_cluster.items()) if only is None or c in only]
+    rows.append(("TOTAL", [s for sts in by_cluster.values() for s in sts]))
+    for cluster, sts in rows:
+        completed = sum(1 for s in sts if s.status == "WORKFLOW_EXECUTION_STATUS_COMPLETED")
+        failed = sum(1 for s in sts if s.status in TERMINAL_STATUSES) - completed
+        running = len(sts) - completed - failed
+        missing = sum(no_id.values()) if cluster == "TOTAL" else no_id.get(cluster, 0)
+        pct = 100 * (completed + failed) / len(sts) if sts else 0
+        rate, eta = estimate_progress(sts)
+        rate_str = f"{rate:.1f}" if rate is not None else "-"
+        eta_str = format_duration(eta) if eta is not None else ("done" if not running else "-")
+        print(f"{cluster:<22} {f'{completed}/{len(sts)}':>9} {pct:>4.0f}% {failed:>7} {running:>8} "
+              f"{missing:>6} {rate_str:>7} {eta_str:>7}")
+
+
+def watch(
+    tracking: dict,
+    jobs: list[dict],
+    filtered_jobs: list[dict],
+    statuses: dict[str, WorkflowStatus],
+    args: argparse.Namespace
+):
+    """Re-query unfinished workflows every interval; print only what changed."""
+    job_by_workflow = {j["temporal_workflow_id"]: j for j in filtered_jobs if j.get("temporal_workflow_id")}
+
+    print_cluster_progress(filtered_jobs, statuses)
+    since_table = 0  # refreshes since the full table was printed
+    while True:
+        pending = [
+            w for w in job_by_workflow
+            if w not in statuses or statuses[w].status not in TERMINAL_STATUSES
+        ]
+        if not pending:
+            print("\nAll workflows finished.")
+            return
+
+        time.sleep(args.interval)
+        since_table += 1
+        queried = query_workflow_statuses(
+            pending, args.temporal_address, args.namespace, args.workers
+        )
+        stamp = datetime.now().strftime("%H:%M:%S")
+
+        changed = []
+        for workflow_id, status in queried.items():
+            if status.error:
+                continue  # keep the last known status
+            previous = statuses.get(workflow_id)
+            if previous is None or previous.status != status.status:
+                changed.append((workflow_id, previous.status if previous else "not-queried", status.status))
+            statuses[workflow_id] = status
+
+        if not changed:
+            print(f"[{stamp}] no changes, {len(pending)} workflow(s) unfinished")
+            continue
+
+        print()
+        for workflow_id, old, new in changed:
+            job = job_by_workflow[workflow_id]
+            print(f"[{stamp}] {job.get('customer', ''):<20} {job.get('cluster', ''):<18} "
+                  f"{short_status(old)} -> {short_status(new)}")
+        if args.table_every and since_table >= args.table_every:
+            print_cluster_progress(filtered_jobs, statuses)
+            since_table = 0
+        else:
+            print_cluster_progress(
+                filtered_jobs, statuses, {job_by_workflow[w].get("cluster", "") for w, _, _ in changed}
+            )
+        save_status_cache(args.tracking, {**load_status_cache(args.tracking), **statuses})
+        if args.output:
+            save_tracking(tracking, jobs, statuses, args.output)
 
 
 def print_status_table(jobs: list[dict], statuses: dict[str, WorkflowStatus]):
@@ -184,10 +492,42 @@ def main():
     )
     parser.add_argument(
         "--output", "-o",
-        help="Output updated tracking to a new file"
+        help="Write a copy of the tracking with temporal statuses filled in (--tracking is never rewritten)"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-query workflows whose terminal status is in the status cache"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep refreshing unfinished workflows and show per-cluster progress and ETA"
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=DEFAULT_WATCH_INTERVAL,
+        help=f"Seconds between --watch refreshes (default: {DEFAULT_WATCH_INTERVAL})"
+    )
+    parser.add_argument(
+        "--table-every",
+        type=int,
+        default=DEFAULT_TABLE_EVERY,
+        metavar="N",
+        help="With --watch, print the full per-cluster table every N refreshes; otherwise only "
+             f"the clusters that changed (0 = only at the start, default: {DEFAULT_TABLE_EVERY})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent describe calls for workflows the list query misses (default: {DEFAULT_WORKERS})"
     )
 
     args = parser.parse_args()
+    if args.output and Path(args.output).resolve() == Path(args.tracking).resolve():
+        parser.error("--output must differ from --tracking (backfill_all.py owns the tracking file)")
 
     # Load tracking data
     tracking = load_tracking(args.tracking)
@@ -209,25 +549,28 @@ def main():
 
     print(f"Checking: {len(filtered_jobs)} jobs")
 
-    # Query status for each job
+    # Terminal statuses from earlier checks don't need querying again
+    cache = load_status_cache(args.tracking)
     statuses: dict[str, WorkflowStatus] = {}
+    to_query = []
     for job in filtered_jobs:
         workflow_id = job.get("temporal_workflow_id")
-        if not workflow_id:
+        if not workflow_id or workflow_id in statuses or workflow_id in to_query:
             continue
+        if workflow_id in cache and not args.refresh:
+            statuses[workflow_id] = cache[workflow_id]
+        else:
+            to_query.append(workflow_id)
 
-        print(f"\nQuerying: {workflow_id[:50]}...")
-        status = get_workflow_status(
-            workflow_id,
-            args.temporal_address,
-            args.namespace
-        )
-        statuses[workflow_id] = status
+    print(f"Cached terminal: {len(statuses)}, querying: {len(to_query)}")
+    queried = query_workflow_statuses(
+        to_query, args.temporal_address, args.namespace, args.workers
+    )
+    statuses.update(queried)
 
+    for status in queried.values():
         if status.error:
-            print(f"  Error: {status.error}")
-        else:
-            print(f"  Status: {status.status}")
+            print(f"  Error: {status.workflow_id[:50]}: {status.error}")
 
     # Print summary table
     print_status_table(filtered_jobs, statuses)
@@ -250,24 +593,20 @@ def main():
     for status, count in sorted(status_counts.items()):
         print(f"  {status}: {count}")
 
-    # Save updated tracking if requested
+    # Cache terminal statuses for the next check (other filters' entries are kept)
+    if queried:
+        cache.update((w, s) for w, s in queried.items() if not s.error)
+        save_status_cache(args.tracking, cache)
     if args.output:
-        # Update job statuses in tracking
-        for job in jobs:
-            workflow_id = job.get("temporal_workflow_id")
-            if workflow_id and workflow_id in statuses:
-                job["temporal_status"] = statuses[workflow_id].status
-                job["temporal_close_time"] = statuses[workflow_id].close_time
-
-        output_data = {
-            "generated_at": tracking.get("generated_at"),
-            "status_checked_at": datetime.utcnow().isoformat() + "Z",
-            "jobs": jobs
-        }
-        with open(args.output, 'w') as f:
-            json.dump(output_data, f, indent=2)
+        save_tracking(tracking, jobs, statuses, args.output)
         print(f"\nUpdated tracking saved to: {args.output}")
 
+    if args.watch:
+        try:
+            watch(tracking, jobs, filtered_jobs, statuses, args)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+
 
 if __name__ == "__main__":
     main()
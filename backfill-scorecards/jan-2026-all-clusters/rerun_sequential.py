@@ -3,6 +3,8 @@
 Sequential backfill for cvs and oportun - one day at a time.
 
 Tracks progress in sequential_tracking.json so it can resume after interruption.
+Per-day updates are appended to sequential_tracking.journal.jsonl and folded into
+the JSON on exit (see ../tracking_journal.py).
 
 Usage:
     python3 rerun_sequential.py              # Run Jan 1-31, skipping completed days
@@ -29,11 +31,17 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from k8s_jobs import JobRenderer, apply_jobs
+from tracking_journal import TrackingJournal
+
 # ---- Config ----
 
 CLUSTER = "us-west-2-prod"
 CONTEXT = f"{CLUSTER}_dev"
 CUSTOMERS = "cvs,oportun"
+CRON_NAMESPACE = "cresta-cron"
+CRONJOB_NAME = "cron-batch-reindex-conversations"
 TEMPORAL_NS = "ingestion"
 TEMPORAL_ADDR = "localhost:7233"
 SCRIPT_DIR = Path(__file__).parent
@@ -46,16 +54,24 @@ WORKFLOW_DISCOVERY_WAIT = 15  # seconds after job creation
 
 # ---- Tracking ----
 
+JOURNAL = TrackingJournal(TRACKING_FILE)
+
+
 def load_tracking() -> dict:
-    if TRACKING_FILE.exists():
-        with open(TRACKING_FILE) as f:
-            return json.load(f)
+    tracking = JOURNAL.load()
+    if tracking is not None:
+        return tracking
     return init_tracking()
 
 
 def save_tracking(data: dict):
-    with open(TRACKING_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    """Write a full snapshot. Per-day changes go through update_day instead."""
+    JOURNAL.save(data)
+
+
+def update_day(tracking: dict, key: str, **fields):
+    """Update one day's tracking fields and journal the change."""
+    JOURNAL.update(tracking, ("days", key), **fields)
 
 
 def init_tracking() -> dict:
@@ -202,47 +218,14 @@ def create_job(day: int) -> str:
     suffix = f"jan{day:02d}"
     job_name = f"batch-reindex-seq-{suffix}-{int(time.time())}"
 
-    yaml_raw = f"/tmp/reindex-job-{suffix}.yaml"
-    yaml_final = f"/tmp/reindex-job-{suffix}-final.yaml"
-
-    # Generate from cronjob template
-    rc, _, stderr = run([
-        "kubectl", "create", "job", f"--from=cronjob/cron-batch-reindex-conversations",
-        job_name, "-n", "cresta-cron", f"--context={CONTEXT}",
-        "--dry-run=client", "-o", "yaml",
-    ])
-    if rc != 0:
-        raise RuntimeError(f"Failed to create job template: {stderr}")
-
-    # Write raw yaml (captured from stdout would be better, but kubectl writes to stdout)
-    rc, stdout, stderr = run([
-        "kubectl", "create", "job", f"--from=cronjob/cron-batch-reindex-conversations",
-        job_name, "-n", "cresta-cron", f"--context={CONTEXT}",
-        "--dry-run=client", "-o", "yaml",
-    ])
-    if rc != 0:
-        raise RuntimeError(f"Failed to create job template: {stderr}")
-    with open(yaml_raw, "w") as f:
-        f.write(stdout)
-
-    # Set env vars
-    rc, stdout, stderr = run([
-        "kubectl", "set", "env", "--local", f"-f={yaml_raw}",
-        f"REINDEX_START_TIME={start_time}",
-        f"REINDEX_END_TIME={end_time}",
-        f"RUN_ONLY_FOR_CUSTOMER_IDS={CUSTOMERS}",
-        "-o", "yaml",
-    ])
-    if rc != 0:
-        raise RuntimeError(f"Failed to set env: {stderr}")
-    with open(yaml_final, "w") as f:
-        f.write(stdout)
-
-    # Apply
-    rc, _, stderr = run([
-        "kubectl", "apply", "-f", yaml_final, f"--context={CONTEXT}",
-    ])
-    if rc != 0:
+    # Render from the cronjob template (fetched once per run) and apply
+    job = JobRenderer(CONTEXT, CRON_NAMESPACE, CRONJOB_NAME).render(job_name, {
+        "REINDEX_START_TIME": start_time,
+        "REINDEX_END_TIME": end_time,
+        "RUN_ONLY_FOR_CUSTOMER_IDS": CUSTOMERS,
+    })
+    applied, stderr = apply_jobs(CONTEXT, CRON_NAMESPACE, [job])
+    if job_name not in applied:
         raise RuntimeError(f"Failed to apply job: {stderr}")
 
     print(f"  Job created: {job_name}")
@@ -342,13 +325,9 @@ def cmd_reset(day: int):
     if key not in tracking["days"]:
         print(f"Invalid day: {day}")
         sys.exit(1)
-    tracking["days"][key]["status"] = "pending"
-    tracking["days"][key]["error"] = None
-    tracking["days"][key]["job_name"] = None
-    tracking["days"][key]["workflow_ids"] = []
-    tracking["days"][key]["started_at"] = None
-    tracking["days"][key]["completed_at"] = None
-    save_tracking(tracking)
+    update_day(tracking, key, status="pending", error=None, job_name=None,
+               workflow_ids=[], started_at=None, completed_at=None)
+    JOURNAL.close(tracking)
     print(f"Day {day} reset to pending")
 
 
@@ -361,6 +340,7 @@ def cmd_run():
 
     def cleanup(sig=None, frame=None):
         pf.stop()
+        JOURNAL.close(tracking)
         if sig:
             print(f"\nInterrupted. Progress saved to {TRACKING_FILE}")
             sys.exit(1)
@@ -385,21 +365,15 @@ def cmd_run():
             print("============================================================")
 
             # Update tracking: running
-            day_info["status"] = "running"
-            day_info["started_at"] = now_iso()
-            day_info["error"] = None
-            save_tracking(tracking)
+            update_day(tracking, key, status="running", started_at=now_iso(), error=None)
 
             # Create k8s job
             try:
                 job_name = create_job(day)
-                day_info["job_name"] = job_name
-                save_tracking(tracking)
+                update_day(tracking, key, job_name=job_name)
             except RuntimeError as e:
                 print(f"  ERROR creating job: {e}")
-                day_info["status"] = "failed"
-                day_info["error"] = str(e)
-                save_tracking(tracking)
+                update_day(tracking, key, status="failed", error=str(e))
                 continue
 
             # Wait for workflows to spawn
@@ -412,29 +386,22 @@ def cmd_run():
 
             if not workflow_ids:
                 print("  No running workflows found. May have completed instantly.")
-                day_info["status"] = "completed"
-                day_info["completed_at"] = now_iso()
-                save_tracking(tracking)
+                update_day(tracking, key, status="completed", completed_at=now_iso())
                 continue
 
             print(f"  Found {len(workflow_ids)} workflow(s):")
             for wf_id in workflow_ids:
                 print(f"    - {wf_id}")
 
-            day_info["workflow_ids"] = workflow_ids
-            save_tracking(tracking)
+            update_day(tracking, key, workflow_ids=workflow_ids)
 
             # Wait for completion
             success, error = wait_for_workflows(workflow_ids, pf)
 
             if success:
-                day_info["status"] = "completed"
-                day_info["completed_at"] = now_iso()
+                update_day(tracking, key, status="completed", completed_at=now_iso())
             else:
-                day_info["status"] = "failed"
-                day_info["error"] = error
-
-            save_tracking(tracking)
+                update_day(tracking, key, status="failed", error=error)
             print(f"  Day {day}: {day_info['status']}")
 
     finally:
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Render k8s Jobs from a CronJob template in-process and submit them in bulk.
+
+The backfill scripts used to create each job with three kubectl calls
+(`create job --from=cronjob --dry-run`, `set env --local`, `apply`) going
+through temp YAML files at fixed /tmp paths. This fetches the CronJob once per
+(context, namespace, cronjob), builds each Job the way
+`kubectl create job --from=cronjob/...` does, sets the env vars on every
+container the way `kubectl set env` does, and submits any number of Jobs with a
+single `kubectl apply` of a List read from stdin.
+
+Usage:
+    renderer = JobRenderer(context, "cresta-cron", "cron-batch-reindex-conversations")
+    job = renderer.render("batch-reindex-foo-1700000000", {"REINDEX_START_TIME": "..."})
+    created, error = apply_jobs(context, "cresta-cron", [job])
+
+Created: 2026-10-19
+"""
+
+import copy
+import json
+import subprocess
+import threading
+
+APPLY_TIMEOUT = 120  # seconds for one bulk apply
+
+_cronjobs: dict[tuple[str, str, str], dict] = {}
+_cronjobs_lock = threading.Lock()
+
+
+def fetch_cronjob(context: str, namespace: str, cronjob: str) -> dict:
+    """The CronJob object, fetched once per (context, namespace, name) and cached."""
+    key = (context, namespace, cronjob)
+    with _cronjobs_lock:
+        if key not in _cronjobs:
+            try:
+                result = subprocess.run([
+                    "kubectl", "get", "cronjob", cronjob,
+                    "-n", namespace, f"--context={context}", "-o", "json",
+                ], capture_output=True, text=True, timeout=60)
+            except subprocess.TimeoutExpired:
+                raise RuntimeError(f"Timed out fetching cronjob/{cronjob} on {context}")
+            if result.returncode != 0:
+                raise RuntimeError(f"Failed to fetch cronjob/{cronjob} on {context}: {result.stderr.strip()}")
+            _cronjobs[key] = json.loads(result.stdout)
+        return _cronjobs[key]
+
+
+def set_env(pod_spec: dict, env: dict[str, str]):
+    """Set env vars on every (init) container, replacing same-named entries like `kubectl set env`."""
+    for container in pod_spec.get("initContainers", []) + pod_spec.get("containers", []):
+        entries = [e for e in container.get("env", []) if e.get("name") not in env]
+        entries.extend({"name": name, "value": value} for name, value in env.items())
+        container["env"] = entries
+
+
+class JobRenderer:
+    """Builds Job manifests from one CronJob's jobTemplate."""
+
+    def __init__(self, context: str, namespace: str, cronjob: str):
+        self.context = context
+        self.namespace = namespace
+        self.cronjob = cronjob
+
+    def render(self, job_name: str, env: dict[str, str]) -> dict:
+        """A Job equivalent to `kubectl create job --from=cronjob/...` followed by `kubectl set env`."""
+        cronjob = fetch_cronjob(self.context, self.namespace, self.cronjob)
+        template = cronjob["spec"]["jobTemplate"]
+        template_meta = template.get("metadata", {})
+
+        annotations = dict(template_meta.get("annotations", {}))
+        annotations["cronjob.kubernetes.io/instantiate"] = "manual"
+        spec = copy.deepcopy(template["spec"])
+        set_env(spec["template"]["spec"], env)
+
+        return {
+            "apiVersion": "batch/v1",
+            "kind": "Job",
+            "metadata": {
+                "name": job_name,
+                "namespace": self.namespace,
+                "labels": dict(template_meta.get("labels", {})),
+                "annotations": annotations,
+                "ownerReferences": [{
+                    "apiVersion": "batch/v1",
+                    "kind": "CronJob",
+                    "name": cronjob["metadata"]["name"],
+                    "uid": cronjob["metadata"]["uid"],
+                    "controller": True,
+                }],
+            },
+            "spec": spec,
+        }
+
+
+def apply_jobs(context: str, namespace: str, jobs: list[dict]) -> tuple[set[str], str]:
+    """
+    Submit Jobs with one `kubectl apply` of a List.
+
+    Returns (names of the jobs that were created/applied, error output). kubectl
+    applies the items independently, so some can succeed while others fail.
+    """
+    if not jobs:
+        return set(), ""
+    manifest = json.dumps({"apiVersion": "v1", "kind": "List", "items": jobs})
+    try:
+        result = subprocess.run([
+            "kubectl", "apply", "-f", "-", "-n", namespace, f"--context={context}",
+            "-o", "name",
+        ], input=manifest, capture_output=True, text=True, timeout=APPLY_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return set(), f"kubectl apply timed out after {APPLY_TIMEOUT}s"
+    # -o name prints one "job.batch/<name>" per applied item
+    applied = {line.split("/", 1)[-1] for line in result.stdout.split() if line}
+    return applied, result.stderr.strip()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Per-thread line prefixes on stdout for scripts that run customers/jobs concurrently.
+
+cluster_cleanup.py (--concurrency/--clusters) and jan-2026-all-clusters/
+backfill_all.py (--parallel) print from many worker threads at once. Installing
+PrefixedStdout as sys.stdout and calling set_log_prefix("[cluster/customer] ")
+in each worker keeps every line whole and tagged with where it came from.
+
+Usage:
+    sys.stdout = PrefixedStdout(sys.stdout)
+    set_log_prefix("[us-east-1-prod] ")
+    ...
+    sys.stdout = sys.stdout.stream
+
+Created: 2026-10-19
+"""
+
+import sys
+import threading
+
+
+class PrefixedStdout:
+    """
+    stdout wrapper that prefixes each line with the writing thread's log prefix.
+
+    Lines are buffered per thread and written whole, so concurrent customers
+    don't interleave mid-line. Threads without a prefix write through unchanged.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def set_prefix(self, prefix: str):
+        self._local.prefix = prefix
+
+    def get_prefix(self) -> str:
+        return getattr(self._local, "prefix", "")
+
+    def write(self, text: str) -> int:
+        prefix = getattr(self._local, "prefix", "")
+        if not prefix:
+            with self._lock:
+                return self.stream.write(text)
+        buf = getattr(self._local, "buf", "") + text
+        *lines, self._local.buf = buf.split("\n")
+        if lines:
+            with self._lock:
+                for line in lines:
+                    self.stream.write(f"{prefix}{line}\n" if line else "\n")
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def set_log_prefix(prefix: str):
+    if isinstance(sys.stdout, PrefixedStdout):
+        sys.stdout.set_prefix(prefix)
+
+
+def get_log_prefix() -> str:
+    """Current thread's log prefix; background threads copy their creator's."""
+    if isinstance(sys.stdout, PrefixedStdout):
+        return sys.stdout.get_prefix()
+    return ""
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Crash-safe tracking store: JSON snapshot + append-only JSONL journal.
+
+The backfill/cleanup scripts used to re-serialize and rewrite their whole
+tracking JSON on every status change. A crash mid-write left a truncated file,
+and the cost grew with the number of customers/days tracked.
+
+This keeps the existing tracking JSON as a snapshot (same layout, so --status
+and anything else that reads it keeps working) and records each per-item
+update as one line in a sidecar journal, `<name>.journal.jsonl`:
+
+    {"ts": "2026-10-19T10:00:00Z", "key": ["customers", "cvs"], "set": {"status": "completed"}}
+
+Appends are flushed and fsync'd, so an update is durable once update() returns.
+Loading replays the journal over the snapshot and skips unreadable lines (a torn
+line from a crash, or one a live writer is still appending). Loading never
+writes, so other processes (--status, planners reading other clusters' files)
+can load while a run owns the file. Compaction writes the snapshot atomically
+(temp file + rename) and then clears the journal; only the owning writer does it
+(periodically from update(), and from save()/close()). Updates are plain field
+assignments, so replaying a journal that was already folded into the snapshot is
+harmless.
+
+Writers are serialized per TrackingJournal (threads in one process). Running two
+writing processes against the same tracking file is not supported.
+
+Usage:
+    journal = TrackingJournal(path)
+    tracking = journal.load()                                  # None if no snapshot yet
+    journal.save(tracking)                                     # full snapshot (init / bulk edits)
+    journal.update(tracking, ("customers", "cvs"), status="completed")
+    journal.close(tracking)                                    # compact + release
+
+Created: 2026-10-19
+"""
+
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Fold the journal into the snapshot after this many appended updates
+COMPACT_EVERY = 200
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def journal_path_for(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(f"{path.stem}.journal.jsonl")
+
+
+def apply_update(data: dict, key: list, fields: dict):
+    """Set `fields` on the item at `key` (a path of dict keys), creating it if missing."""
+    node = data
+    for part in key:
+        node = node.setdefault(part, {})
+    node.update(fields)
+
+
+class TrackingJournal:
+    """Tracking JSON snapshot plus an append-only journal of per-item updates."""
+
+    def __init__(self, path: Path, compact_every: int = COMPACT_EVERY):
+        self.path = Path(path)
+        self.journal_path = journal_path_for(self.path)
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self._fh = None
+        self._pending = 0
+
+    # ---- Reading ----
+
+    def _read_journal(self) -> list[dict]:
+        """Journal records in order, skipping lines that aren't complete records."""
+        try:
+            with open(self.journal_path) as f:
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            return []
+        records = []
+        for lineno, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Torn by a crash (appends after it start on a new line, see
+                # _open_journal), or the writer's append is still in flight
+                if lineno < len(lines):
+                    print(f"WARNING: {self.journal_path}:{lineno}: unreadable journal entry, skipped",
+                          file=sys.stderr)
+        return records
+
+    def load(self) -> dict:
+        """Snapshot with the journal replayed on top, or None if there is no snapshot. Read-only."""
+        with self._lock:
+            if not self.path.exists():
+                return None
+            with open(self.path) as f:
+                data = json.load(f)
+            records = self._read_journal()
+            for rec in records:
+                apply_update(data, rec["key"], rec["set"])
+            self._pending = len(records)
+            return data
+
+    # ---- Writing ----
+
+    def _write_snapshot(self, data: dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def _open_journal(self):
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        # A crash can leave a torn last line without a newline; start on a fresh one
+        # so the next record isn't glued onto it
+        torn = False
+        if self.journal_path.exists() and self.journal_path.stat().st_size:
+            with open(self.journal_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+        self._fh = open(self.journal_path, "a")
+        if torn:
+            self._fh.write("\n")
+
+    def _clear_journal(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self._pending = 0
+
+    def save(self, data: dict):
+        """Write a full snapshot and drop the journal it supersedes."""
+        with self._lock:
+            self._write_snapshot(data)
+            self._clear_journal()
+
+    compact = save
+
+    def update(self, data: dict, key: tuple, **fields):
+        """Apply `fields` to the item at `key` in memory and journal the change."""
+        with self._lock:
+            apply_update(data, list(key), fields)
+            if not self.path.exists():
+                # Nothing to replay onto yet: the snapshot is the record
+                self._write_snapshot(data)
+                return
+            if self._fh is None:
+                self._open_journal()
+            line = json.dumps({"ts": now_iso(), "key": list(key), "set": fields})
+            self._fh.write(line + "\n")
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._pending += 1
+            if self.compact_every and self._pending >= self.compact_every:
+                self.compact(data)
+
+    def close(self, data: dict = None):
+        """Compact (if given the current data and there is anything to fold) and release the journal."""
+        with self._lock:
+            if data is not None and self._pending:
+                self.compact(data)
+            elif self._fh is not None:
+                self._fh.close()
+                self._fh = None
@@ -256,6 +256,37 @@ def is_manually_scored(score):
     return numeric_value is None or numeric_value != ai_value
 
 
+def compute_scorecard_scores(computed_scores, auto_failed_ids=()):
+    """Recompute overall scorecard scores for a batch of computed score rows.
+
+    Single pass over all rows of the batch: accumulates sum(percentage * float_weight)
+    and sum(float_weight) per scorecard_id, then divides. Rows without a percentage
+    or with zero weight don't contribute (same as Go's weighted average).
+    Auto-failed scorecards score 0.
+
+    Returns dict of scorecard_id -> score (None when no criterion contributes).
+    """
+    weighted = {}
+    weights = {}
+    for css in computed_scores:
+        sc_id = css["scorecard_id"]
+        weighted.setdefault(sc_id, 0.0)
+        weights.setdefault(sc_id, 0.0)
+        pct = css["percentage_value"]
+        w = css["float_weight"]
+        if pct is None or not w:
+            continue
+        weighted[sc_id] += pct * w
+        weights[sc_id] += w
+
+    scores = {}
+    for sc_id, total_weight in weights.items():
+        scores[sc_id] = weighted[sc_id] / total_weight if total_weight > 0 else None
+    for sc_id in auto_failed_ids:
+        scores[sc_id] = 0.0
+    return scores
+
+
 # ── Validation ────────────────────────────────────────────────────────────────
 
 def validate(pg_conn, customer, profile, num_scorecards=10):
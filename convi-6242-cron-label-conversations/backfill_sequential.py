@@ -3,14 +3,26 @@
 Sequential backfill for conversation_with_labels — one day at a time.
 
 Handles the full workflow: delete existing data → wait for mutation → create
-k8s job → wait for job completion → verify. Tracks progress in JSON for
-resume after interruption.
+k8s job → wait for job completion → verify. The delete for the next day(s) runs
+while the current day's job is running (--lookahead). Tracks progress in JSON for
+resume after interruption (tracking_<cluster>_<customer>.json snapshot plus an
+append-only .journal.jsonl of per-day updates, see
+../backfill-scorecards/tracking_journal.py).
 
 Usage:
     python3 backfill_sequential.py --cluster us-east-1-prod --customer alaska-air
     python3 backfill_sequential.py --cluster us-east-1-prod --customer alaska-air --status
     python3 backfill_sequential.py --cluster us-east-1-prod --customer alaska-air --reset 2026-01-15
     python3 backfill_sequential.py --cluster us-east-1-prod --customer alaska-air --start 2026-01-01 --end 2026-02-19
+    python3 backfill_sequential.py --cluster us-east-1-prod --customer alaska-air --ch-transport exec
+    python3 backfill_sequential.py --cluster us-east-1-prod --customer alaska-air --delete-mode range
+    python3 backfill_sequential.py --cluster us-east-1-prod --customer alaska-air --parallel 3
+    python3 backfill_sequential.py --cluster us-east-1-prod --customer alaska-air --job-wait poll
+
+ClickHouse queries go over one port-forward to the ClickHouse pod's HTTP port that
+stays open for the whole run (--ch-transport exec: kubectl exec per query). Job
+completion comes from a single `kubectl get jobs -w` stream shared by all day-jobs
+(--job-wait poll: kubectl get per job every 30s).
 
 Prerequisites:
     - VPN connected
@@ -21,15 +33,25 @@ Created: 2026-02-18
 """
 
 import argparse
+import http.client
 import json
 import os
 import signal
+import socket
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+# Shared helpers (tracking_journal.py, k8s_jobs.py, ch_pool.py) live in ../backfill-scorecards
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backfill-scorecards"))
+from ch_pool import is_read_only
+from k8s_jobs import JobRenderer, apply_jobs
+from tracking_journal import TrackingJournal
+
 # ---- Config ----
 
 SCRIPT_DIR = Path(__file__).parent
@@ -39,10 +61,40 @@ CRON_NAMESPACE = "cresta-cron"
 CRONJOB_NAME = "cron-label-conversations"
 
 MAX_WAIT_PER_DAY = 3600      # 1 hour max wait for k8s job
-POLL_INTERVAL = 30            # seconds between job status checks
+POLL_INTERVAL = 30            # seconds between job status checks (--job-wait poll) / progress lines
+
+# "watch" = one `kubectl get jobs -w` stream for the whole run, completion is seen as
+# soon as the API server reports it; "poll" = kubectl get per job every POLL_INTERVAL
+JOB_WAIT = "watch"
+JOB_WATCH_RESTART_DELAY = 5   # seconds before reopening a dropped watch stream
+JOB_WATCH_MAX_FAILURES = 3    # streams in a row that die right away before falling back to polling
 MUTATION_POLL_INTERVAL = 10   # seconds between mutation checks
 MUTATION_TIMEOUT = 600        # 10 minutes max wait for mutation
 
+# "http" = one port-forward to the ClickHouse pod's HTTP port, kept open for the whole
+# run, with a keep-alive connection; "exec" = kubectl exec clickhouse-client per query
+CH_TRANSPORT = "http"
+CH_HTTP_PORT = 8123
+PORT_FORWARD_READY_TIMEOUT = 30  # seconds to wait for the forward to answer /ping
+
+# "day" = one DELETE mutation per day as the day comes up; "range" = one pass per
+# contiguous range of pending days up front (DROP PARTITION where a whole partition
+# is covered and no customer filter applies)
+DELETE_MODE = "day"
+CLUSTER_PARTS = "clusterAllReplicas('conversations', system.parts)"
+
+# --parallel K: day-jobs in flight at once. New jobs wait while ClickHouse is over any
+# of these (checked on the pod the deletes go through)
+PARALLEL = 1
+MAX_PENDING_MUTATIONS = 20       # system.mutations not done
+MAX_DISTRIBUTION_QUEUE = 200     # Distributed insert files not yet sent to shards
+MAX_REPLICATION_QUEUE = 500      # replication queue entries
+CAPACITY_POLL_INTERVAL = 30      # seconds between checks while over a threshold
+
+# Days ahead of the running job whose delete + mutation wait run in the background
+# (0 = strictly one step at a time). Sequential mode only; --parallel rejects --lookahead
+LOOKAHEAD = 1
+
 
 # ---- Helpers ----
 
@@ -78,20 +130,40 @@ def tracking_path(cluster: str, customer: str) -> Path:
     return SCRIPT_DIR / f"tracking_{safe_name}.json"
 
 
-def load_tracking(cluster: str, customer: str, start: str, end: str) -> dict:
+_journals: dict[Path, TrackingJournal] = {}
+
+
+def tracking_journal(cluster: str, customer: str) -> TrackingJournal:
     path = tracking_path(cluster, customer)
-    if path.exists():
-        with open(path) as f:
-            return json.load(f)
+    if path not in _journals:
+        _journals[path] = TrackingJournal(path)
+    return _journals[path]
+
+
+def load_tracking(cluster: str, customer: str, start: str, end: str) -> dict:
+    tracking = tracking_journal(cluster, customer).load()
+    if tracking is not None:
+        return tracking
     return init_tracking(cluster, customer, start, end)
 
 
 def save_tracking(tracking: dict):
-    cluster = tracking["cluster"]
-    customer = tracking["customer"]
-    path = tracking_path(cluster, customer)
-    with open(path, "w") as f:
-        json.dump(tracking, f, indent=2)
+    """Write a full snapshot. Per-day changes go through update_day instead."""
+    # init_tracking stores "all" for an empty customer, tracking_path expects ""
+    customer = "" if tracking["customer"] == "all" else tracking["customer"]
+    tracking_journal(tracking["cluster"], customer).save(tracking)
+
+
+def update_day(tracking: dict, date_str: str, **fields):
+    """Update one day's tracking fields and journal the change."""
+    customer = "" if tracking["customer"] == "all" else tracking["customer"]
+    tracking_journal(tracking["cluster"], customer).update(tracking, ("days", date_str), **fields)
+
+
+def close_tracking(tracking: dict):
+    """Fold the journal into the JSON snapshot."""
+    customer = "" if tracking["customer"] == "all" else tracking["customer"]
+    tracking_journal(tracking["cluster"], customer).close(tracking)
 
 
 def init_tracking(cluster: str, customer: str, start: str, end: str) -> dict:
@@ -143,7 +215,139 @@ def find_ch_pod(cluster: str) -> str:
     raise RuntimeError(f"No ClickHouse pod found in {CH_NAMESPACE} namespace")
 
 
+def free_local_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class CHHttpSession:
+    """
+    Persistent ClickHouse session over the pod's HTTP interface.
+
+    One `kubectl port-forward pod/<ch_pod> <local>:8123` for the whole run and a
+    keep-alive HTTP connection through it, so each query costs a round trip
+    instead of a pod exec plus a clickhouse-client start. Requests reach the pod
+    on localhost, so they authenticate as the same default user as exec'd
+    clickhouse-client. Output is TabSeparated, matching clickhouse-client.
+    """
+
+    def __init__(self, ch_pod: str, context: str):
+        self.ch_pod = ch_pod
+        self.context = context
+        self.local_port = None
+        self.proc = None
+        self.conn = None
+        self._lock = threading.RLock()  # one request at a time on the shared connection
+
+    def start(self):
+        self.close()
+        self.local_port = free_local_port()
+        self.proc = subprocess.Popen(
+            [
+                "kubectl", "port-forward", "-n", CH_NAMESPACE, f"--context={self.context}",
+                f"pod/{self.ch_pod}", f"{self.local_port}:{CH_HTTP_PORT}",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.time() + PORT_FORWARD_READY_TIMEOUT
+        while time.time() < deadline:
+            if self.proc.poll() is not None:
+                break
+            try:
+                if self._request("GET", "/ping", timeout=5).strip() == "Ok.":
+                    print(f"  ClickHouse HTTP session via localhost:{self.local_port} (pid {self.proc.pid})")
+                    return
+            except (OSError, http.client.HTTPException):
+                self._drop_connection()
+            time.sleep(0.5)
+        self.close()
+        raise RuntimeError(f"Port-forward to {self.ch_pod}:{CH_HTTP_PORT} did not become ready")
+
+    def _drop_connection(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def _request(self, method: str, path: str, body: str = None, timeout: int = 120) -> str:
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection("127.0.0.1", self.local_port, timeout=timeout)
+        elif self.conn.sock is not None:
+            self.conn.sock.settimeout(timeout)
+        self.conn.timeout = timeout
+        self.conn.request(method, path, body=body.encode() if body is not None else None)
+        resp = self.conn.getresponse()
+        data = resp.read().decode()
+        if resp.status != 200:
+            raise RuntimeError(f"ClickHouse query failed: HTTP {resp.status}: {data.strip()}")
+        return data
+
+    def query(self, sql: str, timeout: int = 120) -> str:
+        """
+        Run a query; on connection errors reconnects (restarting the forward if it
+        died) and retries once if the query is read-only. A DELETE or DROP PARTITION
+        may already have run on the server, so those raise instead of being resent.
+        """
+        with self._lock:
+            return self._query(sql, timeout)
+
+    def _query(self, sql: str, timeout: int) -> str:
+        for attempt in range(2):
+            if self.proc is None or self.proc.poll() is not None:
+                self.start()
+            try:
+                return self._request("POST", "/", body=sql, timeout=timeout).strip()
+            except (OSError, http.client.HTTPException) as e:
+                self._drop_connection()
+                if not is_read_only(sql):
+                    raise RuntimeError(
+                        f"ClickHouse connection lost during a write ({e}); "
+                        f"it may or may not have been applied: {sql}"
+                    )
+                if attempt == 1:
+                    raise RuntimeError(f"ClickHouse query failed: {e}")
+                print(f"    ClickHouse connection lost ({e}), reconnecting...")
+
+    def close(self):
+        self._drop_connection()
+        if self.proc is not None:
+            self.proc.kill()
+            self.proc.wait()
+            self.proc = None
+
+
+_sessions: dict[tuple[str, str], CHHttpSession] = {}
+
+
+def ch_session(ch_pod: str, context: str) -> CHHttpSession:
+    key = (ch_pod, context)
+    if key not in _sessions:
+        _sessions[key] = CHHttpSession(ch_pod, context)
+    return _sessions[key]
+
+
+def close_ch_sessions():
+    for session in _sessions.values():
+        session.close()
+    _sessions.clear()
+
+
 def ch_query(ch_pod: str, context: str, sql: str, timeout: int = 120) -> str:
+    """Run a ClickHouse query over the persistent HTTP session, or via kubectl exec."""
+    global CH_TRANSPORT
+    if CH_TRANSPORT == "http":
+        try:
+            return ch_session(ch_pod, context).query(sql, timeout=timeout)
+        except RuntimeError as e:
+            if "did not become ready" not in str(e):
+                raise
+            print(f"    WARNING: {e}; falling back to kubectl exec")
+            CH_TRANSPORT = "exec"
+    return ch_query_exec(ch_pod, context, sql, timeout=timeout)
+
+
+def ch_query_exec(ch_pod: str, context: str, sql: str, timeout: int = 120) -> str:
     """Run a ClickHouse query via kubectl exec."""
     rc, stdout, stderr = run([
         "kubectl", "exec", "-n", CH_NAMESPACE, f"--context={context}", ch_pod,
@@ -154,21 +358,24 @@ def ch_query(ch_pod: str, context: str, sql: str, timeout: int = 120) -> str:
     return stdout.strip()
 
 
-def delete_day(ch_pod: str, context: str, customer: str, date_str: str):
-    """Delete existing rows for a single day."""
-    next_date = (datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+def day_after(date_str: str) -> str:
+    return (datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
 
+
+def range_where(customer: str, start_date: str, end_date: str) -> str:
+    """WHERE clause for rows ending in [start_date, end_date), optionally for one customer."""
+    where = (
+        f"conversation_end_time >= '{start_date} 00:00:00' AND "
+        f"conversation_end_time < '{end_date} 00:00:00'"
+    )
     if customer and customer != "all":
-        where = (
-            f"customer_id = '{customer}' AND "
-            f"conversation_end_time >= '{date_str} 00:00:00' AND "
-            f"conversation_end_time < '{next_date} 00:00:00'"
-        )
-    else:
-        where = (
-            f"conversation_end_time >= '{date_str} 00:00:00' AND "
-            f"conversation_end_time < '{next_date} 00:00:00'"
-        )
+        where = f"customer_id = '{customer}' AND {where}"
+    return where
+
+
+def delete_range(ch_pod: str, context: str, customer: str, start_date: str, end_date: str):
+    """Delete existing rows for [start_date, end_date) with a single mutation."""
+    where = range_where(customer, start_date, end_date)
 
     # Count first
     count = ch_query(ch_pod, context, (
@@ -190,6 +397,86 @@ def delete_day(ch_pod: str, context: str, customer: str, date_str: str):
     print(f"    DELETE mutation submitted")
 
 
+def delete_day(ch_pod: str, context: str, customer: str, date_str: str):
+    """Delete existing rows for a single day."""
+    delete_range(ch_pod, context, customer, date_str, day_after(date_str))
+
+
+def contiguous_runs(dates: list[str]) -> list[tuple[str, str]]:
+    """Group sorted dates into [start, end) ranges of consecutive days."""
+    runs = []
+    for date_str in sorted(dates):
+        if runs and runs[-1][1] == date_str:
+            runs[-1] = (runs[-1][0], day_after(date_str))
+        else:
+            runs.append((date_str, day_after(date_str)))
+    return runs
+
+
+def droppable_partitions(ch_pod: str, context: str, start_date: str, end_date: str) -> list[str]:
+    """
+    Partition IDs of conversation_with_labels lying entirely inside [start_date, end_date).
+
+    Only meaningful when the table is partitioned by conversation_end_time; the
+    time bounds come from part metadata on every replica, nothing is scanned.
+    """
+    partition_key = ch_query(ch_pod, context, (
+        f"SELECT partition_key FROM system.tables "
+        f"WHERE database = '{CH_DATABASE}' AND name = 'conversation_with_labels'"
+    ))
+    if "conversation_end_time" not in partition_key:
+        return []
+    result = ch_query(ch_pod, context, (
+        f"SELECT partition_id, min(min_time), max(max_time) "
+        f"FROM {CLUSTER_PARTS} "
+        f"WHERE database = '{CH_DATABASE}' AND table = 'conversation_with_labels' AND active "
+        f"GROUP BY partition_id ORDER BY partition_id"
+    ))
+    partitions = []
+    for line in result.split("\n"):
+        if not line.strip():
+            continue
+        partition_id, min_time, max_time = line.split("\t")
+        if min_time >= f"{start_date} 00:00:00" and max_time < f"{end_date} 00:00:00":
+            partitions.append(partition_id)
+    return partitions
+
+
+def delete_ranges(tracking: dict, ch_pod: str, context: str, customer: str, dates: list[str]) -> None:
+    """
+    Delete all pending days up front, one pass per contiguous range instead of one
+    mutation per day, and mark every covered day delete_done.
+
+    Without a customer filter, partitions entirely inside a range are dropped
+    (metadata only) and the mutation covers the rest. A range that fails is left
+    to the per-day delete in the main loop.
+    """
+    for start_date, end_date in contiguous_runs(dates):
+        covered = [d for d in dates if start_date <= d < end_date]
+        print(f"  Deleting {start_date} to {end_date} ({len(covered)} day(s)) in one pass...")
+        try:
+            where = range_where(customer, start_date, end_date)
+            if not customer or customer == "all":
+                for partition_id in droppable_partitions(ch_pod, context, start_date, end_date):
+                    ch_query(ch_pod, context, (
+                        f"ALTER TABLE {CH_DATABASE}.conversation_with_labels ON CLUSTER 'conversations' "
+                        f"DROP PARTITION ID '{partition_id}' "
+                        f"SETTINGS replication_wait_for_inactive_replica_timeout = 0"
+                    ), timeout=300)
+                    print(f"    Dropped partition {partition_id}")
+            delete_range(ch_pod, context, customer, start_date, end_date)
+            print("    Waiting for mutation to complete...")
+            if not wait_for_mutations(ch_pod, context):
+                print("    Mutation timeout; falling back to per-day deletes for this range")
+                continue
+        except RuntimeError as e:
+            print(f"    ERROR: {e}; falling back to per-day deletes for this range")
+            continue
+        for date_str in covered:
+            update_day(tracking, date_str, delete_done=True)
+        print(f"    Range delete complete.")
+
+
 def wait_for_mutations(ch_pod: str, context: str) -> bool:
     """Wait until all conversation_with_labels mutations complete."""
     elapsed = 0
@@ -207,6 +494,60 @@ def wait_for_mutations(ch_pod: str, context: str) -> bool:
     return False
 
 
+class CapacityGuard:
+    """
+    Holds back new day-jobs while ClickHouse is busy: mutation backlog, Distributed
+    insert queue, or replication queue over their thresholds. One query per check,
+    shared by all workers (at most one check per CAPACITY_POLL_INTERVAL).
+    """
+
+    def __init__(self, ch_pod: str, context: str):
+        self.ch_pod = ch_pod
+        self.context = context
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._busy = ""
+
+    def _check(self) -> str:
+        """Reason the cluster is over capacity, or "" if there's room."""
+        result = ch_query(self.ch_pod, self.context, (
+            "SELECT "
+            "(SELECT count() FROM system.mutations WHERE is_done = 0), "
+            "(SELECT sum(data_files) FROM system.distribution_queue), "
+            "(SELECT count() FROM system.replication_queue)"
+        ))
+        mutations, dist_files, repl_queue = (int(v) if v.isdigit() else 0 for v in result.split("\t"))
+        reasons = []
+        if mutations > MAX_PENDING_MUTATIONS:
+            reasons.append(f"{mutations} pending mutations")
+        if dist_files > MAX_DISTRIBUTION_QUEUE:
+            reasons.append(f"{dist_files} queued distributed inserts")
+        if repl_queue > MAX_REPLICATION_QUEUE:
+            reasons.append(f"{repl_queue} replication queue entries")
+        return ", ".join(reasons)
+
+    def busy(self) -> str:
+        with self._lock:
+            if time.time() - self._checked_at >= CAPACITY_POLL_INTERVAL:
+                try:
+                    self._busy = self._check()
+                except RuntimeError as e:
+                    print(f"    WARNING: capacity check failed: {e}")
+                    self._busy = ""
+                self._checked_at = time.time()
+            return self._busy
+
+    def wait_for_capacity(self, date_str: str):
+        waited = 0
+        while True:
+            reason = self.busy()
+            if not reason:
+                return
+            print(f"  [{date_str}] ClickHouse busy ({reason}), holding job... [{waited}s]")
+            time.sleep(CAPACITY_POLL_INTERVAL)
+            waited += CAPACITY_POLL_INTERVAL
+
+
 # ---- K8s job helpers ----
 
 def create_job(cluster: str, customer: str, date_str: str) -> str:
@@ -221,58 +562,30 @@ def create_job(cluster: str, customer: str, date_str: str) -> str:
     customer_tag = customer if customer and customer != "all" else "all"
     job_name = f"backfill-labels-{customer_tag}-{suffix}-{int(time.time())}"
 
-    yaml_raw = f"/tmp/label-job-{suffix}.yaml"
-    yaml_final = f"/tmp/label-job-{suffix}-final.yaml"
-
-    # Step 1: Create template
-    rc, stdout, stderr = run([
-        "kubectl", "create", "job", f"--from=cronjob/{CRONJOB_NAME}",
-        job_name, "-n", CRON_NAMESPACE, f"--context={context}",
-        "--dry-run=client", "-o", "yaml",
-    ])
-    if rc != 0:
-        raise RuntimeError(f"Failed to create job template: {stderr}")
-    with open(yaml_raw, "w") as f:
-        f.write(stdout)
-
-    # Step 2: Set env vars
-    env_vars = [
-        f"ENABLE_LABEL_CONVERSATIONS_WITH_AGENT_ASSISTANCE=true",
-        f"LABEL_CONVERSATIONS_WITH_AGENT_ASSISTANCE_CONV_START_AT_RANGE_START={start_time}",
-        f"LABEL_CONVERSATIONS_WITH_AGENT_ASSISTANCE_CONV_END_AT_RANGE_END={end_time}",
-    ]
+    env = {
+        "ENABLE_LABEL_CONVERSATIONS_WITH_AGENT_ASSISTANCE": "true",
+        "LABEL_CONVERSATIONS_WITH_AGENT_ASSISTANCE_CONV_START_AT_RANGE_START": start_time,
+        "LABEL_CONVERSATIONS_WITH_AGENT_ASSISTANCE_CONV_END_AT_RANGE_END": end_time,
+    }
     if customer and customer != "all":
-        env_vars.append(
-            f"FILTER_CUSTOMER_IN_LABEL_CONVERSATIONS_WITH_AGENT_ASSISTANCE={customer}"
-        )
+        env["FILTER_CUSTOMER_IN_LABEL_CONVERSATIONS_WITH_AGENT_ASSISTANCE"] = customer
 
-    rc, stdout, stderr = run([
-        "kubectl", "set", "env", "--local", f"-f={yaml_raw}",
-        *env_vars,
-        "-o", "yaml",
-    ])
-    if rc != 0:
-        raise RuntimeError(f"Failed to set env vars: {stderr}")
-    with open(yaml_final, "w") as f:
-        f.write(stdout)
-
-    # Step 3: Apply
-    rc, _, stderr = run([
-        "kubectl", "apply", "-f", yaml_final, f"--context={context}",
-    ])
-    if rc != 0:
+    # Render from the cronjob template (fetched once per cluster) and apply
+    job = JobRenderer(context, CRON_NAMESPACE, CRONJOB_NAME).render(job_name, env)
+    applied, stderr = apply_jobs(context, CRON_NAMESPACE, [job])
+    if job_name not in applied:
         raise RuntimeError(f"Failed to apply job: {stderr}")
 
     print(f"    Job created: {job_name}")
     return job_name
 
 
-def wait_for_job(cluster: str, job_name: str) -> tuple[bool, str]:
+def wait_for_job(cluster: str, job_name: str, max_wait: int = MAX_WAIT_PER_DAY) -> tuple[bool, str]:
     """Wait for a k8s job to complete."""
     context = f"{cluster}_dev"
     elapsed = 0
 
-    while elapsed < MAX_WAIT_PER_DAY:
+    while elapsed < max_wait:
         # Check job status
         rc, stdout, _ = run([
             "kubectl", "get", "job", job_name,
@@ -285,12 +598,7 @@ def wait_for_job(cluster: str, job_name: str) -> tuple[bool, str]:
             if condition == "Complete":
                 return True, ""
             elif condition == "Failed":
-                # Get failure reason from logs
-                _, logs, _ = run([
-                    "kubectl", "logs", "-n", CRON_NAMESPACE, f"--context={context}",
-                    "-l", f"job-name={job_name}", "--tail=20",
-                ], timeout=30)
-                return False, f"Job failed. Last logs:\n{logs[-500:]}"
+                return False, f"Job failed. Last logs:\n{job_failure_logs(context, job_name)}"
 
         # Also check succeeded/failed counts
         rc, stdout, _ = run([
@@ -307,11 +615,138 @@ def wait_for_job(cluster: str, job_name: str) -> tuple[bool, str]:
             if failed > 0:
                 return False, f"Job has {failed} failed pod(s)"
 
-        print(f"    Waiting for job... [{elapsed}s]")
+        print(f"    Waiting for {job_name}... [{elapsed}s]")
         time.sleep(POLL_INTERVAL)
         elapsed += POLL_INTERVAL
 
-    return False, f"Timeout after {MAX_WAIT_PER_DAY}s"
+    return False, f"Timeout after {max_wait}s"
+
+
+def job_failure_logs(context: str, job_name: str) -> str:
+    """Last log lines of a failed job's pods."""
+    _, logs, _ = run([
+        "kubectl", "logs", "-n", CRON_NAMESPACE, f"--context={context}",
+        "-l", f"job-name={job_name}", "--tail=20",
+    ], timeout=30)
+    return logs[-500:]
+
+
+def job_outcome(job: dict) -> tuple[str, str]:
+    """("complete" | "failed" | "", error) from a Job object; "" while it is still running."""
+    status = job.get("status") or {}
+    for cond in status.get("conditions") or []:
+        if cond.get("status") != "True":
+            continue
+        if cond.get("type") == "Complete":
+            return "complete", ""
+        if cond.get("type") == "Failed":
+            return "failed", ""  # error filled in from the logs by the waiter
+    if status.get("succeeded"):
+        return "complete", ""
+    if status.get("failed"):
+        return "failed", f"Job has {status['failed']} failed pod(s)"
+    return "", ""
+
+
+class JobWatcher:
+    """
+    Follows all jobs in CRON_NAMESPACE over one `kubectl get jobs -w -o json` stream.
+
+    A reader thread records each job's outcome as soon as the API server reports
+    it and wakes the waiters, so any number of jobs can be waited on for the cost
+    of one watch. Outcomes are kept for every job seen, so a job that finishes
+    before anyone waits on it is not missed; a reopened stream re-lists all jobs
+    first, which covers events lost while it was down. Logs are only fetched for
+    jobs that failed. If the stream keeps dying, wait() falls back to wait_for_job.
+    """
+
+    def __init__(self, cluster: str):
+        self.cluster = cluster
+        self.context = f"{cluster}_dev"
+        self._outcomes: dict[str, tuple[str, str]] = {}
+        self._cond = threading.Condition()
+        self._proc = None
+        self._stopped = False
+        self._dead = False
+        self._thread = threading.Thread(target=self._follow, name="job-watch", daemon=True)
+        self._thread.start()
+
+    def _follow(self):
+        failures = 0
+        while not self._stopped:
+            started = time.time()
+            try:
+                self._proc = subprocess.Popen([
+                    "kubectl", "get", "jobs", "-n", CRON_NAMESPACE, f"--context={self.context}",
+                    "-w", "-o", "json",
+                ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+                self._read(self._proc.stdout)
+                self._proc.wait()
+            except OSError as e:
+                print(f"WARNING: job watch failed: {e}")
+            if self._stopped:
+                return
+            # The API server closes watches periodically; only a stream that dies
+            # right away (no access, bad context) counts towards giving up
+            failures = failures + 1 if time.time() - started < 2 * JOB_WATCH_RESTART_DELAY else 0
+            if failures >= JOB_WATCH_MAX_FAILURES:
+                print(f"WARNING: job watch on {self.context} keeps dropping; falling back to polling")
+                with self._cond:
+                    self._dead = True
+                    self._cond.notify_all()
+                return
+            time.sleep(JOB_WATCH_RESTART_DELAY)
+
+    def _read(self, stream):
+        buf = ""
+        for line in stream:
+            buf += line
+            # kubectl prints one indented object per event; only its closing brace is at column 0
+            if line.rstrip("\n") != "}":
+                continue
+            try:
+                job = json.loads(buf)
+            except json.JSONDecodeError:
+                continue
+            buf = ""
+            name = job.get("metadata", {}).get("name")
+            outcome = job_outcome(job)
+            if name and outcome[0]:
+                with self._cond:
+                    self._outcomes[name] = outcome
+                    self._cond.notify_all()
+
+    def wait(self, job_name: str, timeout: int = MAX_WAIT_PER_DAY) -> tuple[bool, str]:
+        """Block until the job completes or fails; same contract as wait_for_job."""
+        started = time.time()
+        next_report = started + POLL_INTERVAL
+        with self._cond:
+            # Woken on every job event in the namespace; only report once per POLL_INTERVAL
+            while job_name not in self._outcomes and not self._dead:
+                now = time.time()
+                if now - started >= timeout:
+                    return False, f"Timeout after {timeout}s"
+                if now >= next_report:
+                    print(f"    Waiting for {job_name}... [{int(now - started)}s]")
+                    next_report += POLL_INTERVAL
+                self._cond.wait(min(next_report, started + timeout) - now)
+            outcome = self._outcomes.get(job_name)
+
+        if outcome is None:
+            # Watch gave up: poll for whatever is left of this job's wait
+            remaining = int(timeout - (time.time() - started))
+            if remaining <= 0:
+                return False, f"Timeout after {timeout}s"
+            return wait_for_job(self.cluster, job_name, remaining)
+        state, error = outcome
+        if state == "complete":
+            return True, ""
+        return False, error or f"Job failed. Last logs:\n{job_failure_logs(self.context, job_name)}"
+
+    def stop(self):
+        self._stopped = True
+        if self._proc and self._proc.poll() is None:
+            self._proc.terminate()
 
 
 # ---- Commands ----
@@ -350,118 +785,188 @@ def cmd_reset(cluster: str, customer: str, start: str, end: str, reset_date: str
     if reset_date not in tracking["days"]:
         print(f"Date {reset_date} not in tracking")
         sys.exit(1)
-    tracking["days"][reset_date] = {
-        "status": "pending",
-        "delete_done": False,
-        "job_name": None,
-        "started_at": None,
-        "completed_at": None,
-        "error": None,
-    }
-    save_tracking(tracking)
+    update_day(tracking, reset_date, status="pending", delete_done=False, job_name=None,
+               started_at=None, completed_at=None, error=None)
+    close_tracking(tracking)
     print(f"Day {reset_date} reset to pending")
 
 
-def cmd_run(cluster: str, customer: str, start: str, end: str, skip_delete: bool):
+def prepare_day(tracking: dict, ch_pod: str, context: str, customer: str, date_str: str,
+                skip_delete: bool) -> bool:
+    """Mark a day running and delete its existing rows (step 1). Returns False if the day failed."""
+    day_info = tracking["days"][date_str]
+    update_day(tracking, date_str, status="running", started_at=now_iso(), error=None)
+
+    if skip_delete or day_info.get("delete_done"):
+        print(f"  [{date_str}] Step 1: Delete skipped (already done or --skip-delete)")
+        return True
+
+    print(f"  [{date_str}] Step 1: Deleting existing data...")
+    try:
+        delete_day(ch_pod, context, customer, date_str)
+        # Wait for mutation
+        print(f"  [{date_str}] Waiting for mutation to complete...")
+        if not wait_for_mutations(ch_pod, context):
+            update_day(tracking, date_str, status="failed", error="Mutation timeout")
+            return False
+        update_day(tracking, date_str, delete_done=True)
+        print(f"  [{date_str}] Mutation complete.")
+        return True
+    except RuntimeError as e:
+        print(f"    ERROR: {e}")
+        update_day(tracking, date_str, status="failed", error=str(e))
+        return False
+
+
+def backfill_day(tracking: dict, cluster: str, customer: str, date_str: str,
+                 jobs: JobWatcher = None) -> None:
+    """Create the day's k8s job and wait for it (steps 2-3), on `jobs` if given, else by polling."""
+    # Step 2: Create k8s job
+    print(f"  [{date_str}] Step 2: Creating backfill job...")
+    try:
+        job_name = create_job(cluster, customer, date_str)
+        update_day(tracking, date_str, job_name=job_name)
+    except RuntimeError as e:
+        print(f"    ERROR: {e}")
+        update_day(tracking, date_str, status="failed", error=str(e))
+        return
+
+    # Step 3: Wait for completion
+    print(f"  [{date_str}] Step 3: Waiting for job completion...")
+    success, error = jobs.wait(job_name) if jobs else wait_for_job(cluster, job_name)
+
+    if success:
+        update_day(tracking, date_str, status="completed", completed_at=now_iso())
+        print(f"  COMPLETED: {date_str}")
+    else:
+        update_day(tracking, date_str, status="failed", error=error)
+        print(f"  FAILED: {date_str} — {error}")
+
+
+def run_parallel(tracking: dict, dates: list[str], cluster: str, customer: str,
+                 ch_pod: str, context: str, skip_delete: bool, parallel: int,
+                 jobs: JobWatcher = None) -> None:
+    """
+    Keep up to `parallel` day-jobs in flight, in date order.
+
+    Deletes stay one at a time (wait_for_mutations waits for every pending mutation
+    on the table), and each new job first waits for ClickHouse capacity.
+    """
+    delete_lock = threading.Lock()
+    guard = CapacityGuard(ch_pod, context) if ch_pod else None
+    if guard is None:
+        print("WARNING: no ClickHouse pod; running without the capacity guard")
+
+    def run_one(date_str: str):
+        with delete_lock:
+            ok = prepare_day(tracking, ch_pod, context, customer, date_str, skip_delete)
+        if not ok:
+            return
+        if guard:
+            guard.wait_for_capacity(date_str)
+        backfill_day(tracking, cluster, customer, date_str, jobs)
+
+    with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="day") as pool:
+        futures = {pool.submit(run_one, d): d for d in dates}
+        for future in as_completed(futures):
+            future.result()
+            with_status = [tracking["days"][d]["status"] for d in dates]
+            print(f"  {futures[future]} done. Completed: {with_status.count('completed')}, "
+                  f"Failed: {with_status.count('failed')}, Running: {with_status.count('running')}, "
+                  f"Pending: {with_status.count('pending')}")
+
+
+def cmd_run(cluster: str, customer: str, start: str, end: str, skip_delete: bool,
+            lookahead: int = LOOKAHEAD, delete_mode: str = DELETE_MODE, parallel: int = PARALLEL):
     tracking = load_tracking(cluster, customer, start, end)
     context = f"{cluster}_dev"
 
     cmd_status(cluster, customer, start, end)
     print()
 
-    # Discover ClickHouse pod
-    if not skip_delete:
+    # Discover ClickHouse pod (also needed by the --parallel capacity guard)
+    if not skip_delete or parallel > 1:
         print("Discovering ClickHouse pod...")
         try:
             ch_pod = find_ch_pod(cluster)
             print(f"Using ClickHouse pod: {ch_pod}")
         except RuntimeError as e:
             print(f"ERROR: {e}")
-            print("Use --skip-delete if deletion was already done externally.")
-            sys.exit(1)
+            if skip_delete:
+                ch_pod = None
+            else:
+                print("Use --skip-delete if deletion was already done externally.")
+                sys.exit(1)
     else:
         ch_pod = None
         print("Skipping delete step (--skip-delete)")
 
+    jobs = JobWatcher(cluster) if JOB_WAIT == "watch" else None
+
     # Signal handling
     def cleanup(sig=None, frame=None):
+        if jobs:
+            jobs.stop()
+        close_ch_sessions()
         if sig:
             print(f"\nInterrupted. Progress saved to {tracking_path(cluster, customer)}")
-            sys.exit(1)
+            sys.stdout.flush()
+            # Don't wait for deletes/jobs in progress in worker threads; unfinished
+            # days are retried on resume
+            os._exit(1)
 
     signal.signal(signal.SIGINT, cleanup)
     signal.signal(signal.SIGTERM, cleanup)
 
-    # Process each day
-    sorted_dates = sorted(tracking["days"].keys())
-    for date_str in sorted_dates:
-        day_info = tracking["days"][date_str]
-
-        if day_info["status"] == "completed":
-            continue
-
+    dates = [d for d in sorted(tracking["days"].keys()) if tracking["days"][d]["status"] != "completed"]
+
+    if delete_mode == "range" and not skip_delete:
+        to_delete = [d for d in dates if not tracking["days"][d].get("delete_done")]
+        if to_delete:
+            print()
+            print(f"Range delete: {len(to_delete)} day(s) in "
+                  f"{len(contiguous_runs(to_delete))} contiguous range(s)")
+            delete_ranges(tracking, ch_pod, context, customer, to_delete)
+
+    if parallel > 1:
+        print(f"\nRunning up to {parallel} day-jobs at once")
+        run_parallel(tracking, dates, cluster, customer, ch_pod, context, skip_delete, parallel, jobs)
+        dates = []
+
+    # Process each day. With lookahead > 0, step 1 (delete + mutation wait) for the
+    # next `lookahead` days runs in a background thread, in date order, while the
+    # current day's job runs; a day's job never starts before its own delete is done.
+    prep_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prepare") if lookahead > 0 and dates else None
+    prepared: dict[str, Future] = {}
+
+    def schedule_prepare(upto: int):
+        for d in dates[:upto + 1]:
+            if d not in prepared:
+                prepared[d] = prep_pool.submit(prepare_day, tracking, ch_pod, context, customer, d, skip_delete)
+
+    for i, date_str in enumerate(dates):
         print()
         print("============================================================")
         print(f"Processing: {date_str}")
         print("============================================================")
 
-        # Mark as running
-        day_info["status"] = "running"
-        day_info["started_at"] = now_iso()
-        day_info["error"] = None
-        save_tracking(tracking)
-
-        # Step 1: Delete existing data
-        if not skip_delete and not day_info.get("delete_done"):
-            print("  Step 1: Deleting existing data...")
-            try:
-                delete_day(ch_pod, context, customer, date_str)
-                # Wait for mutation
-                print("  Waiting for mutation to complete...")
-                if not wait_for_mutations(ch_pod, context):
-                    day_info["status"] = "failed"
-                    day_info["error"] = "Mutation timeout"
-                    save_tracking(tracking)
-                    continue
-                day_info["delete_done"] = True
-                save_tracking(tracking)
-                print("    Mutation complete.")
-            except RuntimeError as e:
-                print(f"    ERROR: {e}")
-                day_info["status"] = "failed"
-                day_info["error"] = str(e)
-                save_tracking(tracking)
-                continue
+        if prep_pool:
+            schedule_prepare(i)
+            ok = prepared[date_str].result()
         else:
-            print("  Step 1: Delete skipped (already done or --skip-delete)")
-
-        # Step 2: Create k8s job
-        print("  Step 2: Creating backfill job...")
-        try:
-            job_name = create_job(cluster, customer, date_str)
-            day_info["job_name"] = job_name
-            save_tracking(tracking)
-        except RuntimeError as e:
-            print(f"    ERROR: {e}")
-            day_info["status"] = "failed"
-            day_info["error"] = str(e)
-            save_tracking(tracking)
+            ok = prepare_day(tracking, ch_pod, context, customer, date_str, skip_delete)
+        if not ok:
             continue
 
-        # Step 3: Wait for completion
-        print("  Step 3: Waiting for job completion...")
-        success, error = wait_for_job(cluster, job_name)
+        if prep_pool:
+            # Delete the next days while this day's job runs
+            schedule_prepare(i + lookahead)
+        backfill_day(tracking, cluster, customer, date_str, jobs)
 
-        if success:
-            day_info["status"] = "completed"
-            day_info["completed_at"] = now_iso()
-            print(f"  COMPLETED: {date_str}")
-        else:
-            day_info["status"] = "failed"
-            day_info["error"] = error
-            print(f"  FAILED: {date_str} — {error}")
-
-        save_tracking(tracking)
+    if prep_pool:
+        prep_pool.shutdown()
+    close_tracking(tracking)
+    cleanup()
 
     print()
     print("============================================================")
@@ -473,6 +978,8 @@ def cmd_run(cluster: str, customer: str, start: str, end: str, skip_delete: bool
 # ---- Main ----
 
 def main():
+    global CH_TRANSPORT, JOB_WAIT
+
     parser = argparse.ArgumentParser(
         description="Sequential backfill for conversation_with_labels"
     )
@@ -484,15 +991,38 @@ def main():
     parser.add_argument("--reset", metavar="DATE", help="Reset a date to pending (YYYY-MM-DD)")
     parser.add_argument("--skip-delete", action="store_true",
                         help="Skip the ClickHouse delete step (if already done externally)")
+    parser.add_argument("--delete-mode", choices=["day", "range"], default=DELETE_MODE,
+                        help=f"day = one DELETE per day; range = one DELETE (or partition drop) "
+                             f"per contiguous range of pending days, up front (default: {DELETE_MODE})")
+    parser.add_argument("--parallel", type=int, default=PARALLEL, metavar="K",
+                        help=f"Day-jobs in flight at once; new jobs wait while ClickHouse mutation/"
+                             f"insert queues are over threshold (default: {PARALLEL})")
+    parser.add_argument("--lookahead", type=int, default=None,
+                        help=f"Days ahead of the running job to delete in the background "
+                             f"(0 = no overlap, default: {LOOKAHEAD}; not with --parallel, where "
+                             f"each day-job does its own delete)")
+    parser.add_argument("--ch-transport", choices=["http", "exec"], default=CH_TRANSPORT,
+                        help=f"ClickHouse access: persistent port-forwarded HTTP session or "
+                             f"kubectl exec per query (default: {CH_TRANSPORT})")
+    parser.add_argument("--job-wait", choices=["watch", "poll"], default=JOB_WAIT,
+                        help=f"Job completion: one kubectl watch stream for all jobs, or kubectl get "
+                             f"per job every {POLL_INTERVAL}s (default: {JOB_WAIT})")
 
     args = parser.parse_args()
+    if args.lookahead is not None and args.parallel > 1:
+        parser.error("--lookahead only applies to one day-job at a time; drop it or --parallel")
+    if args.lookahead is None:
+        args.lookahead = LOOKAHEAD
+    CH_TRANSPORT = args.ch_transport
+    JOB_WAIT = args.job_wait
 
     if args.status:
         cmd_status(args.cluster, args.customer, args.start, args.end)
     elif args.reset:
         cmd_reset(args.cluster, args.customer, args.start, args.end, args.reset)
     else:
-        cmd_run(args.cluster, args.customer, args.start, args.end, args.skip_delete)
+        cmd_run(args.cluster, args.customer, args.start, args.end, args.skip_delete,
+                args.lookahead, args.delete_mode, args.parallel)
 
 
 if __name__ == "__main__":